@@ -0,0 +1,67 @@
+"""
+Benchmark the review-stage file scan (utils.file_analyzer.analyze_files).
+
+Generates synthetic backend/frontend trees of increasing size in a temporary
+directory and times the serial, thread-pool and process-pool scans.
+
+    python benchmarks/review_scan_benchmark.py
+    python benchmarks/review_scan_benchmark.py --sizes 100 1000 --workers 4
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_analyzer import analyze_files
+
+SAMPLES = [
+    "from fastapi import APIRouter\n\nrouter = APIRouter()\n\n@router.get('/items')\ndef list_items():\n    return []\n",
+    "# TODO: Implement\npass\n",
+    "import React from 'react';\n\nexport const Card = ({ title }) => {\n  return <div>{title}</div>;\n};\n",
+    "// Write your code here\n",
+    "\n".join(f"value_{n} = compute({n})" for n in range(40)) + "\n",
+]
+
+
+def build_tree(root: str, count: int):
+    rng = random.Random(count)
+    paths = []
+    for index in range(count):
+        side = 'backend' if index % 2 else 'frontend'
+        directory = os.path.join(root, side, f"module_{index // 500}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"file_{index}.{'py' if side == 'backend' else 'tsx'}")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(rng.choice(SAMPLES) * rng.randint(1, 20))
+        paths.append(path)
+    return paths
+
+
+def time_scan(paths, workers: int, executor: str) -> float:
+    start = time.perf_counter()
+    analyze_files(paths, workers=workers, executor=executor)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'files':>8} {'serial':>10} {'threads':>10} {'processes':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as root:
+            paths = build_tree(root, size)
+            serial = time_scan(paths, 1, "serial")
+            threads = time_scan(paths, args.workers, "thread")
+            processes = time_scan(paths, args.workers, "process")
+            print(f"{size:>8} {serial:>9.3f}s {threads:>9.3f}s {processes:>9.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 import os
+import threading
 from dotenv import load_dotenv
-import time
 
 load_dotenv()
 
@@ -12,18 +12,106 @@ class Config:
 
     # Project settings
     OUTPUT_DIR = "output"
+    RUNS_DIR = "runs"  # Stage checkpoints, one sub-directory per run id
+    
+    # Write-behind output queue (useful on slow/NFS volumes); fsync policy: none | batch | file
+    WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "false").lower() == "true"
+    WRITE_BEHIND_FSYNC = os.getenv("WRITE_BEHIND_FSYNC", "batch")
+    WRITE_BEHIND_BATCH_SIZE = 64
+    
+    # Output backend: "disk" writes as files are generated, "memory" keeps them in memory
+    # until the project is finalized and then flushes them as a directory or a tarball
+    OUTPUT_BACKEND = os.getenv("OUTPUT_BACKEND", "disk")
+    OUTPUT_FLUSH_MODE = os.getenv("OUTPUT_FLUSH_MODE", "dir")
+    
+    # Batch mode: one isolated output root per brief
+    BATCH_OUTPUT_DIR = "batch_output"
+    BATCH_RESULTS_FILE = "batch_results.jsonl"
+    BATCH_WORKERS = 2
+    
+    # Daemon mode: warm workflows behind a local job API
+    DAEMON_HOST = "127.0.0.1"
+    DAEMON_PORT = 8765
+    DAEMON_WORKERS = 1
+    DAEMON_MAX_QUEUE = 20
+    DAEMON_OUTPUT_DIR = "daemon_output"
     
     # **FIX: Better rate limiting for free tier**
     MAX_REQUESTS_PER_RUN = 10  # Increased for full workflow
-    REQUEST_DELAY = 60  # Reduced to 1 minute between major steps
-    
-    # **NEW: Agent-specific delays to avoid rate limits**
-    AGENT_DELAYS = {
-        "coordinator": 30,  # 30 seconds after spec generation
-        "backend": 45,      # 45 seconds after backend generation  
-        "frontend": 45,     # 45 seconds after frontend generation
-        "integration": 30   # 30 seconds after integration review
+    
+    # Per-model budgets for the token-bucket rate limiter (free tier defaults)
+    RATE_LIMITS = {
+        "gemini/gemini-2.5-flash": {"rpm": 10, "tpm": 250000},
     }
+    DEFAULT_RATE_LIMIT = {"rpm": 10, "tpm": 250000}
+    RATE_LIMIT_MAX_RETRIES = 3
+    ESTIMATED_COMPLETION_TOKENS = 4000  # Reserved per LLM request until real usage is known
+    MAX_CONCURRENT_STAGES = 2  # Independent workflow stages run side by side up to this limit
+    
+    # Final review file scan: "serial", or a bounded "thread" / "process" pool
+    REVIEW_SCAN_WORKERS = 8
+    REVIEW_SCAN_EXECUTOR = os.getenv("REVIEW_SCAN_EXECUTOR", "serial")
+    
+    # Local batch lint of every generated code file when a project is finalized
+    LINT_ENABLED = os.getenv("LINT_ENABLED", "true").lower() == "true"
+    LINT_WORKERS = 1  # Serial; only batches of thousands of Python files repay a process pool
+    LINT_REPORT_SUFFIX = ".lint_report.json"  # Written as .<output dir name>.lint_report.json beside it
+    LINT_CACHE_PATH = os.path.join(".cache", "lint.json")  # Results keyed by content hash and language
+    
+    # Static API contract check; the LLM integration review only runs when it finds mismatches
+    API_CONTRACT_CHECK_ENABLED = os.getenv("API_CONTRACT_CHECK_ENABLED", "true").lower() == "true"
+    INTEGRATION_CONTEXT_CHARS = 8000  # Code snippets around contract mismatches sent to the integration review
+    
+    # Per-task prompt token budgets; lower-priority context is summarized or truncated to fit
+    CONTEXT_PACKING_ENABLED = os.getenv("CONTEXT_PACKING_ENABLED", "true").lower() == "true"
+    CONTEXT_BUDGETS = {
+        "specification": 6000,
+        "backend": 8000,
+        "frontend": 8000,
+        "integration": 10000,
+        "review": 10000
+    }
+    
+    # Persistent per-file analysis cache (keyed on path, size, mtime and content hash)
+    ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYSIS_CACHE_PATH = os.path.join(".cache", "analysis.json")
+    ANALYSIS_CACHE_MAX_ENTRIES = 20000  # Least recently used files are evicted beyond this
+    
+    # On-disk LLM response cache (keyed on model, temperature, messages and tools)
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_DIR = os.path.join(".cache", "llm")
+    LLM_CACHE_MAX_BYTES = 200 * 1024 * 1024
+    
+    # Token and cost ledger, one JSONL entry per LLM response (agent role, task class, brief)
+    USAGE_LEDGER_ENABLED = os.getenv("USAGE_LEDGER_ENABLED", "true").lower() == "true"
+    USAGE_LEDGER_PATH = os.path.join("usage", "ledger.jsonl")
+    USAGE_LEDGER_MAX_BYTES = 20 * 1024 * 1024  # Rotated to ledger.jsonl.1 beyond this size
+    # USD per million tokens, used for cost estimates only
+    MODEL_PRICING = {
+        "gemini/gemini-2.5-flash": {"prompt": 0.30, "completion": 2.50}
+    }
+    
+    # Span tracing of stages, crew kickoffs, LLM calls, tool calls and rate-limit waits;
+    # one file per run in TRACE_DIR, as a Chrome trace ("chrome") or JSON lines ("jsonl")
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_DIR = "traces"
+    TRACE_FORMAT = os.getenv("TRACE_FORMAT", "chrome")
+    TRACE_MAX_SPANS = 200000
+    TRACE_KEEP = 50  # Most recent trace files kept in TRACE_DIR
+    
+    # Shared LLM client pool used by every agent
+    LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+    LLM_MAX_CONNECTIONS = 10
+    LLM_KEEPALIVE_EXPIRY = 60  # seconds an idle pooled connection is kept open
+    
+    _lock = threading.Lock()
+    _rate_limiter = None
+    _llm_cache = None
+    _llm_registry = None
+    _analysis_cache = None
+    _lint_cache = None
+    _tracer = None
+    _usage_ledger = None
     
     # Agent configurations
     COORDINATOR_CONFIG = {
@@ -51,20 +139,90 @@ class Config:
     
     @classmethod
     def get_llm(cls):
-        """Get configured free Gemini LLM with better error handling"""
-        from crewai import LLM
+        """Get the shared, pooled Gemini LLM client"""
         if not cls.GEMINI_API_KEY:
             raise Exception("GEMINI_API_KEY not found. Get free key from: https://aistudio.google.com/app/apikey")
         
-        return LLM(
-            model=cls.MODEL_NAME,
-            temperature=cls.MODEL_TEMPERATURE,
-            api_key=cls.GEMINI_API_KEY
+        cache = cls.get_llm_cache() if cls.LLM_CACHE_ENABLED else None
+        return cls.get_llm_registry().get(
+            cls.MODEL_NAME,
+            cls.MODEL_TEMPERATURE,
+            cls.GEMINI_API_KEY,
+            cache=cache
         )
     
     @classmethod
-    def apply_delay(cls, agent_type: str):
-        """Apply appropriate delay to avoid rate limits"""
-        delay_seconds = cls.AGENT_DELAYS.get(agent_type, 30)
-        print(f"⏳ Applying {delay_seconds}s delay for {agent_type} to avoid rate limits...")
-        time.sleep(delay_seconds)
\ No newline at end of file
+    def get_llm_registry(cls):
+        """Get the process-wide LLM client registry shared by all agents"""
+        rate_limiter = cls.get_rate_limiter()  # Outside the lock, which is not reentrant
+        with cls._lock:
+            if cls._llm_registry is None:
+                from utils.llm_pool import LLMClientRegistry
+                cls._llm_registry = LLMClientRegistry(
+                    max_in_flight=cls.LLM_MAX_IN_FLIGHT,
+                    max_connections=cls.LLM_MAX_CONNECTIONS,
+                    keepalive_expiry=cls.LLM_KEEPALIVE_EXPIRY,
+                    rate_limiter=rate_limiter,
+                    completion_tokens=cls.ESTIMATED_COMPLETION_TOKENS
+                )
+            return cls._llm_registry
+    
+    @classmethod
+    def get_llm_cache(cls):
+        """Get the process-wide on-disk LLM response cache"""
+        with cls._lock:
+            if cls._llm_cache is None:
+                from utils.llm_cache import LLMResponseCache
+                cls._llm_cache = LLMResponseCache(cls.LLM_CACHE_DIR, cls.LLM_CACHE_MAX_BYTES)
+            return cls._llm_cache
+    
+    @classmethod
+    def get_analysis_cache(cls):
+        """Get the process-wide per-file analysis cache used by the review stage"""
+        with cls._lock:
+            if cls._analysis_cache is None:
+                from utils.analysis_cache import AnalysisCache
+                cls._analysis_cache = AnalysisCache(cls.ANALYSIS_CACHE_PATH, cls.ANALYSIS_CACHE_MAX_ENTRIES)
+            return cls._analysis_cache
+    
+    @classmethod
+    def get_lint_cache(cls):
+        """Get the process-wide lint result cache shared by the linter tool and batch lint"""
+        with cls._lock:
+            if cls._lint_cache is None:
+                from tools.lint_cache import LintCache
+                cls._lint_cache = LintCache(cls.LINT_CACHE_PATH)
+            return cls._lint_cache
+    
+    @classmethod
+    def get_tracer(cls):
+        """Get the process-wide span tracer, installed for tools and LLM clients to report into"""
+        with cls._lock:
+            if cls._tracer is None:
+                from utils.tracing import Tracer, set_tracer
+                cls._tracer = Tracer(cls.TRACE_MAX_SPANS)
+                set_tracer(cls._tracer)
+            return cls._tracer
+    
+    @classmethod
+    def get_usage_ledger(cls):
+        """Get the process-wide token usage ledger (in-memory only when the ledger is disabled)"""
+        with cls._lock:
+            if cls._usage_ledger is None:
+                from utils.usage_ledger import UsageLedger
+                ledger_path = cls.USAGE_LEDGER_PATH if cls.USAGE_LEDGER_ENABLED else None
+                cls._usage_ledger = UsageLedger(ledger_path, cls.MODEL_PRICING, cls.USAGE_LEDGER_MAX_BYTES)
+            return cls._usage_ledger
+    
+    @classmethod
+    def get_rate_limiter(cls):
+        """Get the process-wide rate limiter shared by all workflow stages"""
+        with cls._lock:
+            if cls._rate_limiter is None:
+                from utils.rate_limiter import RateLimiter
+                cls._rate_limiter = RateLimiter(
+                    cls.RATE_LIMITS,
+                    cls.DEFAULT_RATE_LIMIT,
+                    max_retries=cls.RATE_LIMIT_MAX_RETRIES
+                )
+            return cls._rate_limiter
\ No newline at end of file
@@ -1,24 +1,95 @@
 import os
 import shutil
+import argparse
 from dotenv import load_dotenv
+from config import Config
 from agents.coordinator_agent import CoordinatorAgent
 from agents.backend_agent import BackendAgent
 from agents.frontend_agent import FrontendAgent
 from tools.file_writer import FileWriterTool
 from tools.code_linter import CodeLinterTool
+from tools.write_behind import WriteBehindQueue
+from tools.output_backend import DiskOutputBackend, MemoryOutputBackend
+from tools.output_manifest import OutputManifest
 from workflows.architect_workflow import ArchitectWorkflow
+from workflows.batch_runner import BatchRunner
+from workflows.checkpoint import CheckpointStore
+from workflows.architect_daemon import ArchitectDaemon, serve
 
-def setup_environment():
+def setup_environment(output_dir: str = Config.OUTPUT_DIR):
     """Setup output directory and ensure clean state"""
-    output_dir = "output"
-    
     # Create fresh output directory
+    OutputManifest.discard(output_dir)
     if os.path.exists(output_dir):
         shutil.rmtree(output_dir)
     os.makedirs(output_dir)
     print(f"📁 Created clean output directory: {output_dir}")
 
+def build_workflow(output_dir: str = Config.OUTPUT_DIR) -> ArchitectWorkflow:
+    """Create tools, agents and a workflow that writes into output_dir"""
+    # Output backend shared by every file writer of this workflow
+    if Config.OUTPUT_BACKEND == "memory":
+        backend = MemoryOutputBackend(Config.OUTPUT_FLUSH_MODE)
+    else:
+        write_queue = None
+        if Config.WRITE_BEHIND_ENABLED:
+            write_queue = WriteBehindQueue(Config.WRITE_BEHIND_FSYNC, Config.WRITE_BEHIND_BATCH_SIZE)
+        backend = DiskOutputBackend(write_queue)
+    
+    # Initialize tools (one file writer per agent so the manifest records the writing stage)
+    file_writer = FileWriterTool(output_dir=output_dir, stage="coordinator", backend=backend)
+    backend_file_writer = FileWriterTool(output_dir=output_dir, stage="backend", backend=backend)
+    frontend_file_writer = FileWriterTool(output_dir=output_dir, stage="frontend", backend=backend)
+    review_file_writer = FileWriterTool(output_dir=output_dir, stage="review", backend=backend)
+    code_linter = CodeLinterTool(cache=Config.get_lint_cache())
+    
+    # Initialize agents with tools
+    coordinator_agent = CoordinatorAgent(tools=[file_writer, code_linter])
+    backend_agent = BackendAgent(tools=[backend_file_writer, code_linter])
+    frontend_agent = FrontendAgent(tools=[frontend_file_writer, code_linter])
+    
+    agents = {
+        'coordinator': coordinator_agent,
+        'backend': backend_agent,
+        'frontend': frontend_agent
+    }
+    
+    tools = {
+        'file_writer': file_writer,
+        'backend_file_writer': backend_file_writer,
+        'frontend_file_writer': frontend_file_writer,
+        'review_file_writer': review_file_writer,
+        'code_linter': code_linter
+    }
+    
+    return ArchitectWorkflow(agents, tools, output_dir=output_dir, backend=backend)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI Software Architect")
+    parser.add_argument('--batch', metavar='BRIEFS_JSONL',
+                        help="Process every brief in a JSONL file instead of the built-in brief")
+    parser.add_argument('--results', default=Config.BATCH_RESULTS_FILE,
+                        help="JSONL file receiving one result record per brief (batch mode)")
+    parser.add_argument('--workers', type=int, default=Config.BATCH_WORKERS,
+                        help="Number of briefs processed concurrently (batch mode)")
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help="Resume a previous run, skipping stages whose inputs are unchanged")
+    parser.add_argument('--serve', action='store_true',
+                        help="Run as a daemon accepting briefs over a local HTTP job API")
+    parser.add_argument('--host', default=Config.DAEMON_HOST, help="Daemon bind address")
+    parser.add_argument('--port', type=int, default=Config.DAEMON_PORT, help="Daemon port")
+    return parser.parse_args()
+
+def run_batch(args):
+    """Run all briefs from a JSONL file on a bounded worker pool"""
+    print(f"📚 Batch mode: {args.batch} -> {args.results} ({args.workers} workers)")
+    runner = BatchRunner(build_workflow, Config.BATCH_OUTPUT_DIR, max_workers=args.workers)
+    summary = runner.run(args.batch, args.results)
+    print(f"\n✅ Batch finished: {summary['completed']}/{summary['total']} completed, {summary['failed']} failed")
+
 def main():
+    args = parse_args()
+    
     # Load environment variables
     load_dotenv()
     
@@ -28,35 +99,38 @@ def main():
         print("Get free API key from: https://aistudio.google.com/app/apikey")
         return
     
-    # Setup environment
-    setup_environment()
+    if args.batch:
+        run_batch(args)
+        return
+    
+    if args.serve:
+        daemon = ArchitectDaemon(
+            build_workflow,
+            Config.DAEMON_OUTPUT_DIR,
+            workers=Config.DAEMON_WORKERS,
+            max_queue=Config.DAEMON_MAX_QUEUE
+        )
+        serve(daemon, args.host, args.port)
+        return
+    
+    # Setup environment (a resumed run keeps the files generated so far)
+    if args.resume:
+        run_id = args.resume
+        if not os.path.isdir(os.path.join(Config.RUNS_DIR, run_id)):
+            print(f"❌ Error: no checkpoints found for run {run_id} in {Config.RUNS_DIR}/")
+            return
+        print(f"♻️ Resuming run {run_id}")
+    else:
+        run_id = CheckpointStore.new_run_id()
+        setup_environment()
+    print(f"🧾 Run id: {run_id} (resume with --resume {run_id})")
     
     print("🤖 AI Software Architect System")
     print("=" * 50)
     
     try:
-        # Initialize tools
-        file_writer = FileWriterTool()
-        code_linter = CodeLinterTool()
-        
-        # Initialize agents with tools
-        coordinator_agent = CoordinatorAgent(tools=[file_writer, code_linter])
-        backend_agent = BackendAgent(tools=[file_writer, code_linter])
-        frontend_agent = FrontendAgent(tools=[file_writer, code_linter])
-        
-        agents = {
-            'coordinator': coordinator_agent,
-            'backend': backend_agent,
-            'frontend': frontend_agent
-        }
-        
-        tools = {
-            'file_writer': file_writer,
-            'code_linter': code_linter
-        }
-        
-        # Initialize workflow
-        workflow = ArchitectWorkflow(agents, tools)
+        # Initialize tools, agents and workflow
+        workflow = build_workflow()
         
         # Project briefs
         project_briefs = [
@@ -69,7 +143,9 @@ def main():
             print("-" * 60)
             
             try:
-                result = workflow.execute(brief)
+                checkpoints = CheckpointStore(os.path.join(Config.RUNS_DIR, run_id, f"project-{i}"))
+                checkpoints.write_metadata({'run_id': run_id, 'project_brief': brief, 'output_dir': Config.OUTPUT_DIR})
+                result = workflow.execute(brief, checkpoints=checkpoints)
                 
                # UPDATE THE RESULT DISPLAY SECTION:
                 print(f"\n✅ Project {i} Completed!")
@@ -77,8 +153,9 @@ def main():
                 print(f"📁 Generated Files: {result.get('files_count', 0)}")
                 print(f"🔧 Backend Created: {result.get('has_backend', False)}")
                 print(f"🎨 Frontend Created: {result.get('has_frontend', False)}")
-                print(f"🔄 Duplicates Fixed: {result.get('duplicates_found', 0)}")
                 print(f"🔧 Review Issues Fixed: {result.get('review_issues_fixed', False)}")
+                usage_total = result.get('usage', {}).get('total', {})
+                print(f"🪙 Tokens Used: {usage_total.get('total_tokens', 0)} (~${usage_total.get('cost_usd', 0.0):.4f})")
 
 # List generated files (deduplicated)
                 if result.get('generated_files'):
@@ -1,17 +1,33 @@
 from crewai import Task
+from utils.context_packer import Section, pack_prompt
 
 class BackendTask:
-    def __init__(self, backend_agent, specification: str):
+    def __init__(self, backend_agent, specification: str, packer=None):
         self.backend_agent = backend_agent
         self.specification = specification
+        self.packer = packer
+        self.packing_report = None
     
     def create_task(self) -> Task:
+        description, self.packing_report = pack_prompt(
+            self.packer,
+            self._render,
+            # The specification is what the agent implements; it is never cut
+            [Section('specification', self.specification, priority=0, keep_whole=True)],
+            task="backend"
+        )
         return Task(
-            description=f"""
+            description=description,
+            agent=self.backend_agent,
+            expected_output="Summary of the generated backend architecture including key models, endpoints, authentication approach, and file organization."
+        )
+    
+    def _render(self, ctx: dict) -> str:
+        return f"""
             Based on the following backend specification, generate complete, production-ready backend code.
             
             BACKEND SPECIFICATION:
-            {self.specification}
+            {ctx['specification']}
             
             **TECHNOLOGY RECOMMENDATIONS (Adjust based on specification):**
             - FastAPI for REST APIs
@@ -31,12 +47,11 @@ class BackendTask:
             
             **FILE GENERATION:**
             - Use the File Writer tool for ALL files
+            - Write files in BULK: pass `files` as a list of {{"file_path": ..., "content": ...}} objects
+              with subfolder 'backend' so several files are written in a single tool call
             - Place all files in the 'backend/' subfolder  
             - Structure files logically (models, routes, services, etc.)
             - Ensure the architecture matches the project complexity
             
             Return a summary of the backend architecture including: database models, API endpoints, authentication strategy, and file structure.
-            """,
-            agent=self.backend_agent,
-            expected_output="Summary of the generated backend architecture including key models, endpoints, authentication approach, and file organization."
-        )
\ No newline at end of file
+            """
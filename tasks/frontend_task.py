@@ -1,21 +1,41 @@
 from crewai import Task
+from utils.context_packer import Section, pack_prompt
 
 class FrontendTask:
-    def __init__(self, frontend_agent, specification: str, api_structure: str):
+    def __init__(self, frontend_agent, specification: str, api_structure: str, packer=None):
         self.frontend_agent = frontend_agent
         self.specification = specification
         self.api_structure = api_structure
+        self.packer = packer
+        self.packing_report = None
     
     def create_task(self) -> Task:
+        description, self.packing_report = pack_prompt(
+            self.packer,
+            self._render,
+            [
+                # The specification is what the agent implements; it is never cut
+                Section('specification', self.specification, priority=0, keep_whole=True),
+                # Only a reference for integration; the endpoint lines survive summarizing
+                Section('api_structure', self.api_structure, priority=1),
+            ],
+            task="frontend"
+        )
         return Task(
-            description=f"""
+            description=description,
+            agent=self.frontend_agent,
+            expected_output="Summary of the generated React frontend structure including: file organization, key components created, state management approach, and API integration strategy."
+        )
+    
+    def _render(self, ctx: dict) -> str:
+        return f"""
             Based on the following specifications, generate a complete, modern React frontend application.
             
             FRONTEND SPECIFICATION:
-            {self.specification}
+            {ctx['specification']}
             
             BACKEND API STRUCTURE (for integration reference):
-            {self.api_structure}
+            {ctx['api_structure']}
             
             **TECHNOLOGY REQUIREMENTS:**
             - Use React with TypeScript
@@ -35,12 +55,11 @@ class FrontendTask:
             
             **MANDATORY ACTIONS:**
             - Use the File Writer tool for EVERY file you create
+            - Write files in BULK: pass `files` as a list of {{"file_path": ..., "content": ...}} objects
+              with subfolder 'frontend' so several files are written in a single tool call
             - Place all files in the 'frontend/' subfolder
             - Include at minimum: package.json, main App component, and core feature components
             - Ensure API services perfectly match the backend endpoints
             
             Return a summary of the created file structure and how it addresses the project requirements.
-            """,
-            agent=self.frontend_agent,
-            expected_output="Summary of the generated React frontend structure including: file organization, key components created, state management approach, and API integration strategy."
-        )
\ No newline at end of file
+            """
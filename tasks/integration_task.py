@@ -1,21 +1,58 @@
 from crewai import Task
+from utils.context_packer import Section, pack_prompt
 
 class IntegrationTask:
-    def __init__(self, coordinator_agent, backend_code: str, frontend_code: str):
+    def __init__(self, coordinator_agent, backend_code: str, frontend_code: str, contract_report: str = "",
+                 code_context: str = "", packer=None):
         self.coordinator_agent = coordinator_agent
         self.backend_code = backend_code
         self.frontend_code = frontend_code
+        self.contract_report = contract_report
+        self.code_context = code_context
+        self.packer = packer
+        self.packing_report = None
+    
+    def _code_section(self) -> str:
+        """Relevant snippets from the code index when available, otherwise the full generation summaries"""
+        if self.code_context:
+            return f"""RELEVANT CODE (files and symbols involved in the mismatches, with their direct imports):
+            {self.code_context}"""
+        return f"""BACKEND CODE SUMMARY:
+            {self.backend_code}
+            
+            FRONTEND CODE SUMMARY:  
+            {self.frontend_code}"""
     
     def create_task(self) -> Task:
+        description, self.packing_report = pack_prompt(
+            self.packer,
+            self._render,
+            [
+                Section('contract_report', self.contract_report, priority=0),
+                Section('code', self._code_section(), priority=1),
+            ],
+            task="integration"
+        )
         return Task(
-            description=f"""
+            description=description,
+            agent=self.coordinator_agent,
+            expected_output="""Comprehensive integration review containing:
+            - Overall integration readiness assessment
+            - Specific technical mismatches identified
+            - Backend adjustments needed
+            - Frontend adjustments needed  
+            - Priority of fixes (critical/high/medium)
+            """
+        )
+    
+    def _render(self, ctx: dict) -> str:
+        return f"""
             Perform comprehensive integration review between the generated backend and frontend code.
             
-            BACKEND CODE SUMMARY:
-            {self.backend_code}
+            {ctx['code']}
             
-            FRONTEND CODE SUMMARY:  
-            {self.frontend_code}
+            STATIC API CONTRACT CHECK (extracted from the generated files; start from these mismatches):
+            {ctx['contract_report'] or 'Not available'}
             
             **INTEGRATION REVIEW CRITERIA:**
             
@@ -33,13 +70,4 @@ class IntegrationTask:
             - Assess overall system coherence
             
             Provide actionable feedback for both backend and frontend adjustments.
-            """,
-            agent=self.coordinator_agent,
-            expected_output="""Comprehensive integration review containing:
-            - Overall integration readiness assessment
-            - Specific technical mismatches identified
-            - Backend adjustments needed
-            - Frontend adjustments needed  
-            - Priority of fixes (critical/high/medium)
             """
-        )
\ No newline at end of file
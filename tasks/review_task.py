@@ -2,12 +2,54 @@ from crewai import Task
 import os
 import json
 from pathlib import Path
+from tools.output_manifest import OutputManifest
+from tools.output_backend import DiskOutputBackend
+from utils.path_classifier import PathClassifier
+from utils.completeness_model import CompletenessModel
+from utils.context_packer import Section, pack_prompt
+from utils.file_analyzer import EMPTY_FILE_INFO, PLACEHOLDER_PATTERN, analyze_file, analyze_files, analyze_text
 
 class ReviewTask:
-    def __init__(self, review_agent, project_brief: str, specifications: dict):
+    # Ordered (category, keywords) rules; the first rule with a keyword in the path wins
+    BACKEND_CATEGORY_RULES = [
+        ('routers', ('router', 'route')),
+        ('models', ('model',)),
+        ('schemas', ('schema',)),
+        ('services', ('crud', 'service')),
+        ('authentication', ('auth', 'security')),
+        ('configuration', ('config', 'setting')),
+        ('database', ('database', 'db')),
+        ('application', ('main', 'app')),
+    ]
+    FRONTEND_CATEGORY_RULES = [
+        ('components', ('component',)),
+        ('pages', ('page', 'view')),
+        ('services', ('service', 'api')),
+        ('state_management', ('context', 'store')),
+        ('hooks', ('hook',)),
+        ('types', ('type', 'interface')),
+        ('utilities', ('util', 'helper')),
+        ('configuration', ('config',)),
+    ]
+    BACKEND_CLASSIFIER = PathClassifier(BACKEND_CATEGORY_RULES)
+    FRONTEND_CLASSIFIER = PathClassifier(FRONTEND_CATEGORY_RULES)
+    
+    def __init__(self, review_agent, project_brief: str, specifications: dict, output_dir: str = "output",
+                 backend=None, scan_workers: int = 8, scan_executor: str = "serial", analysis_cache=None,
+                 completeness=None, code_index=None, outline_chars: int = 4000, packer=None):
         self.review_agent = review_agent
         self.project_brief = project_brief
         self.specifications = specifications
+        self.output_dir = output_dir
+        self.backend = backend or DiskOutputBackend()
+        self.scan_workers = scan_workers
+        self.scan_executor = scan_executor
+        self.analysis_cache = analysis_cache
+        self.completeness = completeness
+        self.code_index = code_index
+        self.outline_chars = outline_chars
+        self.packer = packer
+        self.packing_report = None
     
     def _scan_project_structure(self) -> dict:
         """Analyze project structure without hardcoded expectations"""
@@ -21,196 +63,172 @@ class ReviewTask:
             }
         }
         
-        output_dir = "output"
+        output_dir = self.output_dir
+        
+        # Read the writer's manifest instead of walking the output tree
+        manifest = OutputManifest.for_dir(output_dir, persist=not self.backend.in_memory)
+        relative_paths = manifest.list_files()
+        file_infos = self._analyze_files(manifest, relative_paths)
+        
+        # Classify each side in one batch call
+        sides = {
+            "backend": ([], self.BACKEND_CLASSIFIER),
+            "frontend": ([], self.FRONTEND_CLASSIFIER)
+        }
+        for relative_path, file_info in zip(relative_paths, file_infos):
+            side = relative_path.split('/', 1)[0]
+            if side in sides:
+                sides[side][0].append((relative_path, file_info))
         
-        if os.path.exists(output_dir):
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, output_dir)
-                    
-                    file_info = self._get_file_info(file_path)
-                    
-                    # Categorize intelligently based on path patterns
-                    if relative_path.startswith('backend/'):
-                        category = self._categorize_backend_file(relative_path)
-                        project_structure["backend"]["files"][relative_path] = file_info
-                        project_structure["backend"]["categories"].setdefault(category, []).append(relative_path)
-                    elif relative_path.startswith('frontend/'):
-                        category = self._categorize_frontend_file(relative_path)
-                        project_structure["frontend"]["files"][relative_path] = file_info
-                        project_structure["frontend"]["categories"].setdefault(category, []).append(relative_path)
+        for side, (entries, classifier) in sides.items():
+            categories = classifier.classify_many([relative_path for relative_path, _ in entries])
+            for (relative_path, file_info), category in zip(entries, categories):
+                project_structure[side]["files"][relative_path] = file_info
+                project_structure[side]["categories"].setdefault(category, []).append(relative_path)
         
         # Analyze completeness based on actual project structure
         self._analyze_completeness(project_structure)
         
         return project_structure
     
+    def _analyze_files(self, manifest: OutputManifest, relative_paths: list) -> list:
+        """Analyze files in manifest order, reusing cached results for unchanged content"""
+        full_paths = [os.path.join(self.output_dir, relative_path) for relative_path in relative_paths]
+        hashes = [(manifest.get(relative_path) or {}).get('sha256') for relative_path in relative_paths]
+        
+        file_infos = [None] * len(full_paths)
+        if self.analysis_cache is not None:
+            file_infos = [self.analysis_cache.get(path, sha256) for path, sha256 in zip(full_paths, hashes)]
+        
+        # Analyze the misses on a bounded pool; results keep manifest order so the merge is deterministic
+        missing = [index for index, info in enumerate(file_infos) if info is None]
+        fresh = analyze_files([full_paths[index] for index in missing], self.backend,
+                              self.scan_workers, self.scan_executor)
+        for index, info in zip(missing, fresh):
+            file_infos[index] = info
+            if self.analysis_cache is not None and info != EMPTY_FILE_INFO:  # Never cache read failures
+                self.analysis_cache.put(full_paths[index], info, hashes[index])
+        
+        if self.analysis_cache is not None:
+            try:
+                self.analysis_cache.save()
+            except OSError as e:
+                print(f"⚠️ Could not save analysis cache: {str(e)}")
+        return file_infos
+    
     def _categorize_backend_file(self, file_path: str) -> str:
         """Intelligently categorize backend files without hardcoding"""
-        if 'router' in file_path or 'route' in file_path:
-            return 'routers'
-        elif 'model' in file_path:
-            return 'models'
-        elif 'schema' in file_path:
-            return 'schemas'
-        elif 'crud' in file_path or 'service' in file_path:
-            return 'services'
-        elif 'auth' in file_path or 'security' in file_path:
-            return 'authentication'
-        elif 'config' in file_path or 'setting' in file_path:
-            return 'configuration'
-        elif 'database' in file_path or 'db' in file_path:
-            return 'database'
-        elif 'main' in file_path or 'app' in file_path:
-            return 'application'
-        else:
-            return 'other'
+        return self.BACKEND_CLASSIFIER.classify(file_path)
     
     def _categorize_frontend_file(self, file_path: str) -> str:
         """Intelligently categorize frontend files without hardcoding"""
-        if 'component' in file_path:
-            return 'components'
-        elif 'page' in file_path or 'view' in file_path:
-            return 'pages'
-        elif 'service' in file_path or 'api' in file_path:
-            return 'services'
-        elif 'context' in file_path or 'store' in file_path:
-            return 'state_management'
-        elif 'hook' in file_path:
-            return 'hooks'
-        elif 'type' in file_path or 'interface' in file_path:
-            return 'types'
-        elif 'util' in file_path or 'helper' in file_path:
-            return 'utilities'
-        elif 'config' in file_path:
-            return 'configuration'
-        else:
-            return 'other'
+        return self.FRONTEND_CLASSIFIER.classify(file_path)
     
     def _analyze_completeness(self, project_structure: dict):
         """Analyze project completeness based on architecture patterns"""
-        backend_cats = project_structure["backend"]["categories"]
-        frontend_cats = project_structure["frontend"]["categories"]
-        
-        missing_patterns = []
-        
-        # Check for common architectural patterns (not specific files)
-        if not backend_cats.get('routers') and not backend_cats.get('application'):
-            missing_patterns.append("Backend lacks API routing layer")
-        
-        if not backend_cats.get('services') and not backend_cats.get('crud'):
-            missing_patterns.append("Backend lacks business logic layer")
-        
-        if not frontend_cats.get('components'):
-            missing_patterns.append("Frontend lacks UI components")
-        
-        if not frontend_cats.get('pages') and len(frontend_cats.get('components', [])) < 3:
-            missing_patterns.append("Frontend lacks sufficient component structure")
-        
-        if not frontend_cats.get('services'):
-            missing_patterns.append("Frontend lacks API service layer")
+        # Reuse the live model the workflow keeps up to date from file writes when available
+        model = self.completeness
+        if model is None:
+            model = self.completeness_model()
+            for side in CompletenessModel.SIDES:
+                for relative_path, info in project_structure[side]["files"].items():
+                    model.update(relative_path, info)
         
-        # Calculate completeness score
-        backend_score = min(len(backend_cats) * 10, 40)  # Max 40 points for backend
-        frontend_score = min(len(frontend_cats) * 10, 40)  # Max 40 points for frontend
-        implementation_score = self._calculate_implementation_score(project_structure)
-        
-        total_score = backend_score + frontend_score + implementation_score
-        project_structure["analysis"]["completeness_score"] = total_score
-        project_structure["analysis"]["missing_patterns"] = missing_patterns
+        project_structure["analysis"]["completeness_score"] = model.score()
+        project_structure["analysis"]["missing_patterns"] = model.missing_patterns()
     
-    def _calculate_implementation_score(self, project_structure: dict) -> int:
-        """Score based on actual implementation quality"""
-        score = 0
-        
-        # Check if files have real content vs placeholders
-        all_files = {**project_structure["backend"]["files"], **project_structure["frontend"]["files"]}
-        
-        implemented_files = 0
-        for file_path, info in all_files.items():
-            if info.get('has_content') and not info.get('is_placeholder'):
-                implemented_files += 1
-        
-        if implemented_files > 10:
-            score += 20
-        elif implemented_files > 5:
-            score += 10
-        
-        return score
+    @classmethod
+    def completeness_model(cls, output_dir: str = "", backend=None) -> CompletenessModel:
+        """Completeness model using this task's categorisation rules"""
+        return CompletenessModel(
+            {'backend': cls.BACKEND_CLASSIFIER, 'frontend': cls.FRONTEND_CLASSIFIER},
+            output_dir,
+            backend
+        )
+    
+    def _incomplete_files_outline(self, project_structure: dict) -> str:
+        """Index outline of the files that are still empty, skeletons or placeholders"""
+        if self.code_index is None:
+            return ""
+        incomplete = [
+            relative_path
+            for side in CompletenessModel.SIDES
+            for relative_path, info in project_structure[side]["files"].items()
+            if info.get('implementation_level') in ('empty', 'skeleton', 'placeholder')
+        ]
+        outline = self.code_index.outline(incomplete)
+        if len(outline) > self.outline_chars:
+            outline = outline[:self.outline_chars] + "\n... (truncated)"
+        return outline
     
     def _get_file_info(self, file_path: str) -> dict:
-        """Get detailed file information"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
-            non_empty_lines = [line for line in lines if line.strip() and not line.strip().startswith('#') and not line.strip().startswith('//')]
-            
-            return {
-                "size": len(content),
-                "lines": len(lines),
-                "non_empty_lines": len(non_empty_lines),
-                "has_content": len(non_empty_lines) > 0,
-                "is_placeholder": self._is_placeholder_content(content),
-                "implementation_level": self._assess_implementation_level(content)
-            }
-        except:
-            return {"size": 0, "lines": 0, "non_empty_lines": 0, "has_content": False, "is_placeholder": True, "implementation_level": "none"}
+        """Get detailed file information (one streaming pass through the output backend)"""
+        return analyze_file(file_path, self.backend)
     
     def _is_placeholder_content(self, content: str) -> bool:
         """Check if content is just placeholder/boilerplate"""
-        placeholder_indicators = [
-            "# Add your code here",
-            "# TODO: Implement",
-            "// TODO: Implement", 
-            "pass",
-            "...",
-            "# Write your code here",
-            "// Write your code here",
-            "return {}",
-            "return null",
-            "return undefined"
-        ]
-        content_lower = content.lower()
-        return any(indicator.lower() in content_lower for indicator in placeholder_indicators)
+        return PLACEHOLDER_PATTERN.search(content) is not None
     
     def _assess_implementation_level(self, content: str) -> str:
         """Assess how well the file is implemented"""
-        if not content.strip():
-            return "empty"
-        
-        lines = content.split('\n')
-        code_lines = [line for line in lines if line.strip() and not line.strip().startswith(('#', '//'))]
-        
-        if len(code_lines) <= 2:
-            return "skeleton"
-        elif self._is_placeholder_content(content):
-            return "placeholder"
-        elif len(code_lines) > 10:
-            return "implemented"
-        else:
-            return "partial"
+        return analyze_text(content)["implementation_level"]
     
     def create_task(self) -> Task:
         project_structure = self._scan_project_structure()
+        backend_categories = project_structure['backend']['categories']
+        frontend_categories = project_structure['frontend']['categories']
         
+        # The scan results come first: they say what is left to do. The original
+        # specifications are background, and the category maps fall back to compact JSON.
+        description, self.packing_report = pack_prompt(
+            self.packer,
+            lambda ctx: self._render(ctx, project_structure['analysis']),
+            [
+                Section('incomplete_outline', self._incomplete_files_outline(project_structure), priority=0),
+                Section('backend_structure', json.dumps(backend_categories, indent=2), priority=1,
+                        summary=json.dumps(backend_categories, separators=(',', ':'))),
+                Section('frontend_structure', json.dumps(frontend_categories, indent=2), priority=1,
+                        summary=json.dumps(frontend_categories, separators=(',', ':'))),
+                Section('backend_spec', self.specifications.get('backend_spec', ''), priority=2),
+                Section('frontend_spec', self.specifications.get('frontend_spec', ''), priority=2),
+            ],
+            task="review"
+        )
         return Task(
-            description=f"""
+            description=description,
+            agent=self.review_agent,
+            expected_output="""
+            INTELLIGENT COMPLETION REPORT:
+            
+            1. STRUCTURE ANALYSIS: What the current project contained
+            2. COMPLETION STRATEGY: How you approached finishing the project
+            3. IMPLEMENTATIONS ADDED: Specific functionality completed
+            4. ARCHITECTURE ENHANCED: Missing patterns you addressed
+            5. FUNCTIONALITY ACHIEVED: What the project can now do
+            6. READINESS ASSESSMENT: How complete the project is now
+            
+            Focus on the INTELLIGENT decisions you made based on the existing structure.
+            """
+        )
+    
+    def _render(self, ctx: dict, analysis: dict) -> str:
+        return f"""
             Perform INTELLIGENT PROJECT COMPLETION review for: {self.project_brief}
             
             CURRENT PROJECT ANALYSIS:
-            - Completeness Score: {project_structure['analysis']['completeness_score']}/100
-            - Missing Architectural Patterns: {project_structure['analysis']['missing_patterns']}
-            - Backend Structure: {json.dumps(project_structure['backend']['categories'], indent=2)}
-            - Frontend Structure: {json.dumps(project_structure['frontend']['categories'], indent=2)}
+            - Completeness Score: {analysis['completeness_score']}/100
+            - Missing Architectural Patterns: {analysis['missing_patterns']}
+            - Backend Structure: {ctx['backend_structure']}
+            - Frontend Structure: {ctx['frontend_structure']}
+            
+            FILES STILL EMPTY, SKELETON OR PLACEHOLDER (symbols and local imports):
+            {ctx['incomplete_outline'] or 'None found'}
             
             PROJECT BRIEF: {self.project_brief}
             
             ORIGINAL SPECIFICATIONS:
-            Backend: {self.specifications.get('backend_spec', 'N/A')}
-            Frontend: {self.specifications.get('frontend_spec', 'N/A')}
+            Backend: {ctx['backend_spec'] or 'N/A'}
+            Frontend: {ctx['frontend_spec'] or 'N/A'}
             
             **INTELLIGENT COMPLETION STRATEGY:**
             
@@ -241,20 +259,8 @@ class ReviewTask:
             - Complete existing implementations before creating new files
             - Focus on making the current structure functional
             - Ensure the final result actually runs and delivers value
+            - To fix an EXISTING file, send only the changed lines with the File Writer `patch`
+              (unified diff) or `edits` (search/replace list) options instead of resending the whole file
             
             Use your expertise to determine what completion means for THIS specific project structure.
-            """,
-            agent=self.review_agent,
-            expected_output="""
-            INTELLIGENT COMPLETION REPORT:
-            
-            1. STRUCTURE ANALYSIS: What the current project contained
-            2. COMPLETION STRATEGY: How you approached finishing the project
-            3. IMPLEMENTATIONS ADDED: Specific functionality completed
-            4. ARCHITECTURE ENHANCED: Missing patterns you addressed
-            5. FUNCTIONALITY ACHIEVED: What the project can now do
-            6. READINESS ASSESSMENT: How complete the project is now
-            
-            Focus on the INTELLIGENT decisions you made based on the existing structure.
             """
-        )
\ No newline at end of file
@@ -1,15 +1,36 @@
 from crewai import Task
+from utils.context_packer import Section, pack_prompt
 
 class SpecificationTask:
-    def __init__(self, coordinator_agent):
+    # Longest brief repeated verbatim in the specification heading
+    TITLE_CHARS = 120
+    
+    def __init__(self, coordinator_agent, packer=None):
         self.coordinator_agent = coordinator_agent
+        self.packer = packer
+        self.packing_report = None
     
     def create_task(self, project_brief: str) -> Task:
+        title = project_brief.strip().split('\n', 1)[0]
+        if len(title) > self.TITLE_CHARS:
+            title = title[:self.TITLE_CHARS - 3] + "..."
+        description, self.packing_report = pack_prompt(
+            self.packer,
+            lambda ctx: self._render(ctx, title),
+            [Section('project_brief', project_brief, priority=0)],
+            task="specification"
+        )
         return Task(
-            description=f"""
+            description=description,
+            agent=self.coordinator_agent,
+            expected_output="Comprehensive technical specifications with clearly separated BACKEND_SPEC and FRONTEND_SPEC sections, following the requested markdown structure."
+        )
+    
+    def _render(self, ctx: dict, title: str) -> str:
+        return f"""
             Analyze the following project brief and create detailed, technology-agnostic technical specifications.
             
-            PROJECT BRIEF: {project_brief}
+            PROJECT BRIEF: {ctx['project_brief']}
             
             **ANALYSIS APPROACH:**
             1. Identify core domain entities and their relationships
@@ -28,7 +49,7 @@ class SpecificationTask:
             
             ---
             
-            ## Technical Specifications for: "{project_brief}"
+            ## Technical Specifications for: "{title}"
             
             ### PROJECT ANALYSIS
             [Brief overview of the project domain and key requirements]
@@ -48,7 +69,4 @@ class SpecificationTask:
              - API integration points]
             
             ---
-            """,
-            agent=self.coordinator_agent,
-            expected_output="Comprehensive technical specifications with clearly separated BACKEND_SPEC and FRONTEND_SPEC sections, following the requested markdown structure."
-        )
\ No newline at end of file
+            """
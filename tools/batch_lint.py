@@ -0,0 +1,164 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from tools.lint_cache import LintCache
+from tools.lint_rules import language_for_path, lint_code
+
+# Below this many Python files a process pool costs more than it saves: a spawned
+# worker re-imports the project (crewai, litellm) before its first file, while
+# a file lints serially in ~2-13 ms
+PARALLEL_THRESHOLD = 2000
+
+
+def _lint_job(job: Tuple[str, str]) -> Dict[str, Any]:
+    code, language = job
+    return lint_code(code, language)
+
+
+class BatchLinter:
+    """
+    Lints every code file of a generated project in one local pass.
+
+    Languages are inferred from file extensions. Files are linted in-process;
+    with `workers` > 1, batches of at least PARALLEL_THRESHOLD Python files
+    (the `ast.parse` work) go to one long-lived process pool, started on first
+    use and kept until `close()`. Files are read through the output
+    backend, so in-memory output can be linted before it is flushed.
+
+    With a LintCache, results are reused for identical content across
+    directories and runs, so only files whose content was never linted before
+    are parsed. The output manifest's SHA-256s let cached files skip the read.
+    """
+
+    def __init__(self, workers: int = 1, cache: Any = None):
+        self.workers = max(1, workers)
+        self.cache = cache
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Spawned, not forked: lint runs from scheduler and batch worker threads
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def close(self):
+        """Shut down the worker pool, if one was started"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _read(self, full_path: str, backend: Any) -> Optional[str]:
+        try:
+            if backend is not None:
+                return backend.read(full_path)
+            with open(full_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def lint_files(self, output_dir: str, relative_paths: List[str], backend: Any = None,
+                   hashes: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Lint the given files; returns {relative_path: lint result} in input order.
+        `hashes` (e.g. SHA-256s from the output manifest) lets cached results skip the read.
+        """
+        return self._lint_files(output_dir, relative_paths, backend, hashes)[0]
+
+    def _lint_files(self, output_dir: str, relative_paths: List[str], backend: Any,
+                    hashes: Optional[Dict[str, str]]) -> Tuple[Dict[str, Dict[str, Any]], int]:
+        """lint_files plus the number of files actually linted (not served from the cache)"""
+        hashes = hashes or {}
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        languages: Dict[str, str] = {}
+        jobs = []
+        for relative_path in relative_paths:
+            language = language_for_path(relative_path)
+            if language is None:
+                continue
+            sha256 = hashes.get(relative_path)
+            cached = self.cache.get(sha256, language) if self.cache is not None and sha256 else None
+            if cached is None:
+                code = self._read(os.path.join(output_dir, relative_path), backend)
+                if code is None:
+                    continue
+                if self.cache is not None and not sha256:
+                    sha256 = LintCache.hash_code(code)
+                    cached = self.cache.get(sha256, language)
+                if cached is None:
+                    jobs.append((relative_path, code, language, sha256))
+            results[relative_path] = cached
+            languages[relative_path] = language
+
+        python_jobs = [job for job in jobs if job[2] == 'python']
+        if self.workers > 1 and len(python_jobs) >= PARALLEL_THRESHOLD:
+            chunksize = max(1, len(python_jobs) // (self.workers * 4))
+            linted = self._get_pool().map(_lint_job, [(code, language) for _, code, language, _ in python_jobs],
+                                          chunksize=chunksize)
+            for (relative_path, _, _, _), result in zip(python_jobs, linted):
+                results[relative_path] = result
+
+        for relative_path, code, language, sha256 in jobs:
+            if results[relative_path] is None:
+                results[relative_path] = lint_code(code, language)
+            if self.cache is not None:
+                self.cache.put(sha256, language, results[relative_path])
+
+        return {
+            relative_path: {'language': languages[relative_path], **result}
+            for relative_path, result in results.items()
+        }, len(jobs)
+
+    @staticmethod
+    def build_report(output_dir: str, results: Dict[str, Dict[str, Any]], elapsed: float = 0.0) -> Dict[str, Any]:
+        """Consolidated JSON-serialisable report over per-file lint results"""
+        by_language: Dict[str, int] = {}
+        for result in results.values():
+            by_language[result['language']] = by_language.get(result['language'], 0) + 1
+        return {
+            'output_dir': output_dir,
+            'files_linted': len(results),
+            'invalid_syntax': [path for path, result in results.items() if not result['valid_syntax']],
+            'issues': sum(len(result['issues']) for result in results.values()),
+            'warnings': sum(len(result['warnings']) for result in results.values()),
+            'by_language': by_language,
+            'elapsed_seconds': round(elapsed, 3),
+            'files': results
+        }
+
+    def lint_project(self, output_dir: str, relative_paths: List[str], backend: Any = None,
+                     report_path: Optional[str] = None, manifest: Any = None) -> Dict[str, Any]:
+        """
+        Lint a project, reading files through `backend` when given, and
+        optionally write the JSON report to `report_path` on disk. With
+        `manifest`, its content hashes are used for the cache lookups.
+        """
+        start = time.perf_counter()
+        hashes = {}
+        if manifest is not None:
+            hashes = {path: entry['sha256'] for path in relative_paths for entry in [manifest.get(path)] if entry}
+
+        results, linted = self._lint_files(output_dir, relative_paths, backend, hashes)
+        if self.cache is not None:
+            self.cache.save()
+
+        report = self.build_report(output_dir, results, time.perf_counter() - start)
+        report['relinted'] = linted
+        report['cache'] = self.cache.stats() if self.cache is not None else None
+        if report_path:
+            directory = os.path.dirname(report_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{report_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            os.replace(tmp_path, report_path)
+        return report
@@ -1,15 +1,82 @@
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from crewai.tools import BaseTool
 from pydantic import Field
+from tools.output_manifest import OutputManifest
+from tools.patch_apply import apply_unified_diff, apply_search_replace
+from tools.output_backend import DiskOutputBackend
+from utils.tracing import span
 
 class FileWriterTool(BaseTool):
     name: str = "File Writer"
-    description: str = "Writes code files to the specified directory structure with proper path handling"
+    description: str = (
+        "Writes code files to the specified directory structure with proper path handling. "
+        "To write several files in ONE call, pass `files` as a list of objects with "
+        "`file_path` and `content` (and optionally `subfolder`) instead of `file_path`/`content`. "
+        "To change an EXISTING file, send only the changed lines: pass `file_path` with either `patch` "
+        "(a unified diff with @@ hunks) or `edits` (a list of {\"search\": ..., \"replace\": ...} objects)."
+    )
     output_dir: str = Field(default="output", description="Base directory where files will be written")
+    stage: str = Field(default="", description="Workflow stage recorded in the output manifest for each write")
+    skipped_writes: int = Field(default=0, description="Writes skipped because the content was unchanged")
+    backend: Any = Field(default_factory=DiskOutputBackend, description="Output backend (disk, write-behind or in-memory)")
 
-    def _run(self, file_path: str, content: str, overwrite: bool = True, subfolder: str = "") -> Dict[str, Any]:
+    def _run(self, file_path: str = "", content: str = "", overwrite: bool = True, subfolder: str = "",
+             files: Optional[List[Dict[str, Any]]] = None, patch: str = "",
+             edits: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        mode = "batch" if files else "patch" if patch or edits else "write"
+        with span(f"tool:{self.name}", "tool", mode=mode, stage=self.stage,
+                  files=len(files) if files else 1, file_path=file_path):
+            if files:
+                return self._write_many(files, overwrite, subfolder)
+            if patch or edits:
+                return self._patch_file(file_path, subfolder, patch, edits)
+            return self._write_one(file_path, content, overwrite, subfolder)
+
+    def _resolve_path(self, file_path: str, subfolder: str):
+        """Return (full_path, output_path, cleaned_file_path, cleaned_subfolder)"""
+        # **FIX: Proper path construction to avoid double folders**
+        if subfolder:
+            # Clean subfolder path (remove leading/trailing slashes)
+            subfolder = subfolder.strip().strip('/').strip('\\')
+            output_path = Path(self.output_dir) / subfolder
+        else:
+            output_path = Path(self.output_dir)
+
+        # **FIX: Clean file path properly**
+        file_path = file_path.strip().lstrip('/').lstrip('\\')
+
+        # **FIX: Prevent double subfolder names**
+        if subfolder and file_path.startswith(subfolder):
+            file_path = file_path[len(subfolder):].lstrip('/').lstrip('\\')
+
+        return output_path / file_path, output_path, file_path, subfolder
+
+    def _manifest(self) -> OutputManifest:
+        return OutputManifest.for_dir(self.output_dir, persist=not self.backend.in_memory)
+
+    def _write_file(self, full_path: Path, content: str) -> bool:
+        """
+        Atomically write content and register it in the output manifest.
+        Returns False (and counts a skipped write) when the file already holds identical content.
+        """
+        data = content.encode('utf-8')
+        sha256 = OutputManifest.hash_content(data)
+        relative_path = os.path.relpath(full_path, self.output_dir).replace('\\', '/')
+        manifest = self._manifest()
+
+        entry = manifest.get(relative_path)
+        if entry and entry['sha256'] == sha256 and self.backend.exists(full_path):
+            self.skipped_writes += 1
+            manifest.record_skip()
+            return False
+
+        self.backend.write(full_path, content)
+        manifest.record(relative_path, len(data), sha256, self.stage, content)
+        return True
+
+    def _write_one(self, file_path: str, content: str, overwrite: bool, subfolder: str) -> Dict[str, Any]:
         try:
             # Validate inputs
             if not file_path or not file_path.strip():
@@ -18,43 +85,27 @@ class FileWriterTool(BaseTool):
                     "error": "File path cannot be empty",
                     "path": ""
                 }
-            
+
             if content is None:
                 content = ""
-            
-            # **FIX: Proper path construction to avoid double folders**
-            if subfolder:
-                # Clean subfolder path (remove leading/trailing slashes)
-                subfolder = subfolder.strip().strip('/').strip('\\')
-                output_path = Path(self.output_dir) / subfolder
-            else:
-                output_path = Path(self.output_dir)
-            
-            output_path.mkdir(parents=True, exist_ok=True)
-
-            # **FIX: Clean file path properly**
-            file_path = file_path.strip().lstrip('/').lstrip('\\')
-            
-            # **FIX: Prevent double subfolder names**
-            if subfolder and file_path.startswith(subfolder):
-                file_path = file_path[len(subfolder):].lstrip('/').lstrip('\\')
-            
-            full_path = output_path / file_path
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-
-            if full_path.exists() and not overwrite:
+
+            full_path, output_path, file_path, subfolder = self._resolve_path(file_path, subfolder)
+            self.backend.ensure_dirs([output_path, full_path.parent])
+
+            if self.backend.exists(full_path) and not overwrite:
                 return {
                     "success": False,
                     "error": f"File {file_path} already exists and overwrite is False",
                     "path": str(full_path)
                 }
 
-            # Write file with proper encoding
-            full_path.write_text(content, encoding='utf-8')
+            # Write file with proper encoding (no-op if the content is unchanged)
+            written = self._write_file(full_path, content)
 
             return {
                 "success": True,
-                "message": f"Successfully wrote file: {file_path}",
+                "message": f"Successfully wrote file: {file_path}" if written else f"File unchanged, write skipped: {file_path}",
+                "skipped": not written,
                 "path": str(full_path),
                 "file_size": len(content),
                 "subfolder": subfolder,
@@ -67,4 +118,100 @@ class FileWriterTool(BaseTool):
                 "success": False,
                 "error": f"Failed to write file {file_path}: {str(e)}",
                 "path": str(full_path) if 'full_path' in locals() else file_path
-            }
\ No newline at end of file
+            }
+
+    def _write_many(self, files: List[Dict[str, Any]], overwrite: bool, subfolder: str) -> Dict[str, Any]:
+        """Write a list of files with a single directory-creation pass and a compact summary"""
+        statuses: List[Optional[Dict[str, Any]]] = [None] * len(files)
+        resolved = []
+
+        for index, item in enumerate(files):
+            item = item if isinstance(item, dict) else {}
+            file_path = str(item.get('file_path') or item.get('path') or '')
+            if not file_path.strip():
+                statuses[index] = {"path": file_path, "ok": False, "error": "File path cannot be empty"}
+                continue
+            full_path, _, cleaned_path, item_subfolder = self._resolve_path(
+                file_path, str(item.get('subfolder', subfolder) or '')
+            )
+            relative_path = f"{item_subfolder}/{cleaned_path}" if item_subfolder else cleaned_path
+            resolved.append((index, full_path, relative_path, item.get('content') or ''))
+
+        # Create every distinct parent directory once
+        try:
+            self.backend.ensure_dirs({full_path.parent for _, full_path, _, _ in resolved})
+        except OSError:
+            pass  # Reported per file below
+
+        for index, full_path, relative_path, content in resolved:
+            try:
+                if self.backend.exists(full_path) and not overwrite:
+                    statuses[index] = {"path": relative_path, "ok": False, "error": "exists and overwrite is False"}
+                    continue
+                written = self._write_file(full_path, content)
+                statuses[index] = {"path": relative_path, "ok": True, "size": len(content)}
+                if not written:
+                    statuses[index]["skipped"] = True
+            except Exception as e:
+                statuses[index] = {"path": relative_path, "ok": False, "error": str(e)}
+
+        failed = sum(1 for status in statuses if not status["ok"])
+        skipped = sum(1 for status in statuses if status.get("skipped"))
+        return {
+            "success": failed == 0,
+            "message": f"Wrote {len(statuses) - failed - skipped}/{len(statuses)} files ({skipped} unchanged)",
+            "written": len(statuses) - failed - skipped,
+            "skipped": skipped,
+            "failed": failed,
+            "files": statuses
+        }
+
+    def _patch_file(self, file_path: str, subfolder: str, patch: str,
+                    edits: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+        """Apply a unified diff or search/replace edits; the file is only rewritten if every hunk applies"""
+        try:
+            if not file_path or not file_path.strip():
+                return {"success": False, "error": "File path cannot be empty", "path": ""}
+
+            full_path, _, file_path, subfolder = self._resolve_path(file_path, subfolder)
+            relative_path = f"{subfolder}/{file_path}" if subfolder else file_path
+            if not self.backend.exists(full_path):
+                return {
+                    "success": False,
+                    "error": f"File {relative_path} does not exist; write it with `content` first",
+                    "path": str(full_path)
+                }
+
+            original = self.backend.read(full_path)
+            if patch:
+                patched, applied, rejected = apply_unified_diff(original, patch)
+            else:
+                patched, applied, rejected = apply_search_replace(original, edits)
+
+            if rejected:
+                return {
+                    "success": False,
+                    "error": f"{len(rejected)} hunk(s) rejected; file left unchanged",
+                    "path": str(full_path),
+                    "relative_path": relative_path,
+                    "applied_hunks": len(applied),
+                    "rejected_hunks": rejected
+                }
+
+            self._write_file(full_path, patched)
+            return {
+                "success": True,
+                "message": f"Patched file: {relative_path} ({len(applied)} hunk(s))",
+                "path": str(full_path),
+                "relative_path": relative_path,
+                "applied_hunks": len(applied),
+                "rejected_hunks": [],
+                "file_size": len(patched)
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to patch file {file_path}: {str(e)}",
+                "path": str(full_path) if 'full_path' in locals() else file_path
+            }
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+# Bump when lint rules change so persisted results are discarded
+LINT_RULES_VERSION = 1
+
+
+class LintCache:
+    """
+    Persistent lint results keyed by content hash and language.
+
+    Identical code is never parsed twice, whichever file (or tool call) it
+    comes from. The cache is a single JSON file written atomically by `save()`.
+    """
+
+    def __init__(self, cache_path: str, max_entries: int = 20000):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == LINT_RULES_VERSION:
+            self._entries = data.get('entries', {})
+
+    @staticmethod
+    def hash_code(code: str) -> str:
+        return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _key(sha256: str, language: str) -> str:
+        return f"{language.lower()}:{sha256}"
+
+    def get(self, sha256: str, language: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._entries.get(self._key(sha256, language))
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(json.dumps(result))  # Callers may mutate their copy
+
+    def put(self, sha256: str, language: str, result: Dict[str, Any]):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Drop the oldest half; insertion order approximates age
+                for key in list(self._entries)[:self.max_entries // 2]:
+                    del self._entries[key]
+            self._entries[self._key(sha256, language)] = result
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': LINT_RULES_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries)
+        }
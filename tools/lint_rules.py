@@ -0,0 +1,103 @@
+import ast
+import os
+from typing import Any, Dict, Optional
+
+# Extensions linted in batch mode and the language passed to the rules
+LANGUAGE_BY_EXTENSION = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.mjs': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+}
+
+
+def language_for_path(file_path: str) -> Optional[str]:
+    """Language inferred from the file extension, or None for files that are not linted"""
+    return LANGUAGE_BY_EXTENSION.get(os.path.splitext(file_path)[1].lower())
+
+
+def lint_code(code: str, language: str = "python") -> Dict[str, Any]:
+    """Lint one code string; never raises"""
+    try:
+        if language.lower() in ["python", "py"]:
+            return lint_python(code)
+        elif language.lower() in ["javascript", "js", "typescript", "ts"]:
+            return lint_javascript(code)
+        else:
+            return lint_generic(code, language)
+
+    except Exception as e:
+        return {
+            "valid_syntax": False,
+            "issues": [f"Error during linting: {str(e)}"],
+            "warnings": [],
+            "suggestions": []
+        }
+
+
+def lint_python(code: str) -> Dict[str, Any]:
+    issues = []
+    warnings = []
+    suggestions = []
+
+    try:
+        ast.parse(code)
+        syntax_valid = True
+    except SyntaxError as e:
+        syntax_valid = False
+        issues.append(f"Syntax error: {e.msg} at line {e.lineno}")
+
+    # Check for common issues
+    if "import *" in code:
+        warnings.append("Wildcard import detected - consider importing specific names")
+
+    if len(code.split('\n')) > 100:
+        suggestions.append("Consider breaking down into smaller functions/modules")
+
+    return {
+        "valid_syntax": syntax_valid,
+        "issues": issues,
+        "warnings": warnings,
+        "suggestions": suggestions
+    }
+
+
+def lint_javascript(code: str) -> Dict[str, Any]:
+    issues = []
+    warnings = []
+    suggestions = []
+
+    # Basic syntax checks
+    if "==" in code:
+        warnings.append("Consider using strict equality (===) instead of loose equality (==)")
+
+    if "var " in code:
+        suggestions.append("Consider using 'let' or 'const' instead of 'var' for better scoping")
+
+    # Check for console.log
+    if "console.log" in code:
+        warnings.append("Found console.log statements - remove for production code")
+
+    # Basic bracket matching
+    open_braces = code.count('{')
+    close_braces = code.count('}')
+    if open_braces != close_braces:
+        issues.append(f"Mismatched braces: {open_braces} opening vs {close_braces} closing")
+
+    return {
+        "valid_syntax": True,
+        "issues": issues,
+        "warnings": warnings,
+        "suggestions": suggestions
+    }
+
+
+def lint_generic(code: str, language: str) -> Dict[str, Any]:
+    return {
+        "valid_syntax": True,
+        "issues": [],
+        "warnings": ["Language-specific linting not available"],
+        "suggestions": ["Consider running language-specific linter for detailed analysis"]
+    }
@@ -0,0 +1,166 @@
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, TextIO, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+def atomic_write(full_path: PathLike, content: str):
+    """Write to a temp file in the same directory, then rename over the target"""
+    full_path = Path(full_path)
+    fd, tmp_path = tempfile.mkstemp(dir=full_path.parent, prefix=f".{full_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class DiskOutputBackend:
+    """Writes generated files straight to disk, optionally through a WriteBehindQueue"""
+
+    in_memory = False
+
+    def __init__(self, write_queue: Any = None):
+        self.write_queue = write_queue
+
+    def ensure_dirs(self, directories: Iterable[PathLike]):
+        if self.write_queue is not None:
+            return  # The write-behind thread creates directories itself
+        for directory in directories:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+
+    def write(self, full_path: PathLike, content: str):
+        if self.write_queue is not None:
+            self.write_queue.submit(Path(full_path), content)
+        else:
+            atomic_write(full_path, content)
+
+    def read(self, full_path: PathLike) -> str:
+        """Read a file, preferring content still waiting in the write-behind queue"""
+        if self.write_queue is not None:
+            pending = self.write_queue.pending_content(Path(full_path))
+            if pending is not None:
+                return pending
+        with open(full_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def open(self, full_path: PathLike) -> TextIO:
+        """Text stream over a file for single-pass readers"""
+        if self.write_queue is not None:
+            pending = self.write_queue.pending_content(Path(full_path))
+            if pending is not None:
+                return io.StringIO(pending)
+        return open(full_path, 'r', encoding='utf-8')
+
+    def exists(self, full_path: PathLike) -> bool:
+        if self.write_queue is not None and self.write_queue.pending_content(Path(full_path)) is not None:
+            return True
+        return os.path.isfile(full_path)
+
+    def barrier(self) -> List[Tuple[str, str]]:
+        """Wait for deferred writes; returns (path, error) pairs for writes that failed"""
+        if self.write_queue is None:
+            return []
+        return self.write_queue.barrier()
+
+    def finalize(self, output_dir: str) -> Dict[str, Any]:
+        errors = self.barrier()
+        return {"backend": "disk", "output_dir": output_dir, "write_errors": len(errors)}
+
+
+class MemoryOutputBackend:
+    """
+    Virtual output filesystem kept in memory until `finalize`.
+
+    Intermediate writes and the review-stage read-backs never touch the disk;
+    `finalize(output_dir)` flushes the files under that root to disk or to a
+    tarball. Reads of paths that were never written fall through to disk so
+    resumed runs still see files flushed by an earlier run.
+    """
+
+    in_memory = True
+
+    def __init__(self, flush_mode: str = "dir"):
+        if flush_mode not in ("dir", "tarball"):
+            raise ValueError(f"Unknown flush mode '{flush_mode}', expected 'dir' or 'tarball'")
+        self.flush_mode = flush_mode
+        self._files: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(full_path: PathLike) -> str:
+        return os.path.abspath(str(full_path))
+
+    def ensure_dirs(self, directories: Iterable[PathLike]):
+        pass
+
+    def write(self, full_path: PathLike, content: str):
+        with self._lock:
+            self._files[self._key(full_path)] = content
+
+    def read(self, full_path: PathLike) -> str:
+        with self._lock:
+            content = self._files.get(self._key(full_path))
+        if content is not None:
+            return content
+        with open(full_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def open(self, full_path: PathLike) -> TextIO:
+        with self._lock:
+            content = self._files.get(self._key(full_path))
+        if content is not None:
+            return io.StringIO(content)
+        return open(full_path, 'r', encoding='utf-8')
+
+    def exists(self, full_path: PathLike) -> bool:
+        with self._lock:
+            if self._key(full_path) in self._files:
+                return True
+        return os.path.isfile(full_path)
+
+    def barrier(self) -> List[Tuple[str, str]]:
+        return []
+
+    def _take(self, output_dir: str) -> Dict[str, str]:
+        """Remove and return the files stored under `output_dir`, keyed by relative path"""
+        root = self._key(output_dir)
+        prefix = root + os.sep
+        with self._lock:
+            keys = [key for key in self._files if key.startswith(prefix)]
+            return {
+                os.path.relpath(key, root).replace('\\', '/'): self._files.pop(key)
+                for key in keys
+            }
+
+    def finalize(self, output_dir: str) -> Dict[str, Any]:
+        """Flush every in-memory file under `output_dir` to disk or a tarball"""
+        files = self._take(output_dir)
+        if self.flush_mode == "tarball":
+            tarball_path = f"{output_dir.rstrip('/').rstrip(os.sep)}.tar.gz"
+            with tarfile.open(tarball_path, 'w:gz') as tar:
+                for relative_path, content in sorted(files.items()):
+                    data = content.encode('utf-8')
+                    info = tarfile.TarInfo(relative_path)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    tar.addfile(info, io.BytesIO(data))
+            return {"backend": "memory", "flushed_files": len(files), "tarball": tarball_path}
+
+        created = set()
+        for relative_path, content in files.items():
+            full_path = Path(output_dir) / relative_path
+            if full_path.parent not in created:
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+                created.add(full_path.parent)
+            atomic_write(full_path, content)
+        return {"backend": "memory", "flushed_files": len(files), "output_dir": output_dir}
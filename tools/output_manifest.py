@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class OutputManifest:
+    """
+    In-process index of every file written under an output directory.
+
+    Each entry records size, SHA-256, writer stage and the sequence number of
+    its last write, so scanners can list the tree or ask "what changed since
+    seq N" without walking the filesystem. The index is persisted as an
+    append-only JSONL log next to the output directory (`.<name>.manifest.jsonl`
+    in its parent, so it never ships with the generated project) and compacted
+    when the log grows well past the number of live entries. With
+    `persist=False` (the in-memory output backend) the log is only written by
+    an explicit `compact()` once the files themselves have been flushed.
+    """
+
+    MANIFEST_SUFFIX = ".manifest.jsonl"
+    # Run metadata that older versions left inside the output directory
+    IGNORED_FILES = (".manifest.jsonl", ".lint_report.json")
+
+    _registry: Dict[str, "OutputManifest"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, output_dir: str, persist: bool = True):
+        self.output_dir = output_dir
+        self.persist = persist
+        self.log_path = self.log_path_for(output_dir)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._subscribers: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.RLock()
+        self._seq = 0
+        self._log_lines = 0
+        self.skipped_writes = 0
+        self.load()
+
+    @classmethod
+    def for_dir(cls, output_dir: str, persist: Optional[bool] = None) -> "OutputManifest":
+        """Shared manifest for `output_dir`; reset if the directory was wiped since last use"""
+        key = os.path.abspath(output_dir)
+        with cls._registry_lock:
+            manifest = cls._registry.get(key)
+            if manifest is None:
+                manifest = cls(output_dir, True if persist is None else persist)
+                cls._registry[key] = manifest
+            else:
+                if persist is not None:
+                    manifest.persist = persist
+                # Only a persisted manifest whose directory is gone means it was wiped;
+                # an in-memory run has entries before anything reaches the directory
+                if manifest._entries and manifest._log_lines and not os.path.isdir(output_dir):
+                    manifest.reset()
+            return manifest
+
+    @classmethod
+    def discard(cls, output_dir: str):
+        """Forget the manifest of a directory that is about to be wiped, including its log"""
+        with cls._registry_lock:
+            manifest = cls._registry.get(os.path.abspath(output_dir))
+        if manifest is not None:
+            manifest.reset()  # Reset in place so subscribers stay attached
+            return
+        try:
+            os.remove(cls.log_path_for(output_dir))
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def log_path_for(cls, output_dir: str) -> str:
+        """Manifest log of `output_dir`, kept beside it rather than inside it"""
+        return cls.sidecar_path(output_dir, cls.MANIFEST_SUFFIX)
+
+    @staticmethod
+    def sidecar_path(output_dir: str, suffix: str) -> str:
+        """`.<name><suffix>` in the parent of `output_dir`, for run metadata that must not ship with the project"""
+        parent, name = os.path.split(os.path.abspath(output_dir))
+        return os.path.join(parent, f".{name}{suffix}")
+
+    @staticmethod
+    def hash_content(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def load(self):
+        with self._lock:
+            self._entries = OrderedDict()
+            self._seq = 0
+            self._log_lines = 0
+            if not os.path.isdir(self.output_dir):
+                self._remove_log()  # A log left behind by a removed directory describes nothing
+                return
+            if os.path.exists(self.log_path):
+                with open(self.log_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # Torn final line after a crash
+                        self._entries.pop(entry['path'], None)
+                        self._entries[entry['path']] = entry
+                        self._seq = max(self._seq, entry.get('seq', 0))
+                        self._log_lines += 1
+            elif os.listdir(self.output_dir):
+                self.rebuild()
+
+    def rebuild(self):
+        """Index an existing tree that was not written through the manifest (one full walk)"""
+        with self._lock:
+            self._entries = OrderedDict()
+            for root, dirs, files in os.walk(self.output_dir):
+                for file in files:
+                    full_path = os.path.join(root, file)
+                    relative_path = os.path.relpath(full_path, self.output_dir).replace('\\', '/')
+                    if relative_path in self.IGNORED_FILES:
+                        continue
+                    with open(full_path, 'rb') as f:
+                        data = f.read()
+                    self._seq += 1
+                    self._entries[relative_path] = self._make_entry(
+                        relative_path, len(data), self.hash_content(data), 'unknown', None
+                    )
+            self.compact()
+
+    def _make_entry(self, relative_path: str, size: int, sha256: str, stage: str,
+                    previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'path': relative_path,
+            'size': size,
+            'sha256': sha256,
+            'stage': stage,
+            'seq': self._seq,
+            'created_seq': previous['created_seq'] if previous else self._seq,
+            'written_at': time.time()
+        }
+
+    def record(self, relative_path: str, size: int, sha256: str, stage: str = "",
+               content: Optional[str] = None) -> Dict[str, Any]:
+        """Register a write and notify subscribers; `content` is passed through to them"""
+        relative_path = relative_path.replace('\\', '/').lstrip('/')
+        with self._lock:
+            self._seq += 1
+            previous = self._entries.pop(relative_path, None)
+            entry = self._make_entry(relative_path, size, sha256, stage or 'unknown', previous)
+            self._entries[relative_path] = entry  # Entries stay ordered by last write
+            self._append(entry)
+            subscribers = list(self._subscribers)
+
+        event = {**entry, 'created': previous is None, 'content': content}
+        for callback in subscribers:
+            callback(event)
+        return entry
+
+    def record_skip(self):
+        """Count a write that was skipped because the content hash was unchanged"""
+        with self._lock:
+            self.skipped_writes += 1
+
+    def _append(self, entry: Dict[str, Any]):
+        if not self.persist:
+            return
+        # Create the directory with the log, so a missing directory always means a wipe
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        self._log_lines += 1
+        if self._log_lines > 2 * len(self._entries) + 100:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the log with one line per live entry"""
+        with self._lock:
+            os.makedirs(self.output_dir, exist_ok=True)
+            tmp_path = f"{self.log_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry) + '\n')
+            os.replace(tmp_path, self.log_path)
+            self._log_lines = len(self._entries)
+
+    def reset(self):
+        """Forget all entries (the directory was wiped); sequence numbers keep increasing"""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._log_lines = 0
+            self._remove_log()
+
+    def _remove_log(self):
+        try:
+            os.remove(self.log_path)
+        except FileNotFoundError:
+            pass
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def get(self, relative_path: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(relative_path.replace('\\', '/').lstrip('/'))
+
+    def list_files(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def changes_since(self, seq: int) -> List[str]:
+        """Paths written after sequence number `seq`, walking back only over the changed tail"""
+        with self._lock:
+            changed = []
+            for path in reversed(self._entries):
+                if self._entries[path]['seq'] <= seq:
+                    break
+                changed.append(path)
+            return changed[::-1]
+
+    def created_since(self, seq: int) -> List[str]:
+        """Paths first created after sequence number `seq`"""
+        with self._lock:
+            return [path for path in self.changes_since(seq) if self._entries[path]['created_seq'] > seq]
@@ -0,0 +1,121 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def _parse_hunks(diff: str) -> List[Dict[str, Any]]:
+    """Split a single-file unified diff into hunks of (old_lines, new_lines)"""
+    hunks = []
+    current = None
+    # Lines the current hunk header still promises; "--- "/"+++ " inside that span are content
+    old_remaining = new_remaining = 0
+    for line in diff.splitlines():
+        match = HUNK_HEADER.match(line)
+        if match:
+            current = {
+                'header': line,
+                'old_start': int(match.group(1)),
+                'old_lines': [],
+                'new_lines': []
+            }
+            hunks.append(current)
+            old_remaining = int(match.group(2)) if match.group(2) is not None else 1
+            new_remaining = int(match.group(4)) if match.group(4) is not None else 1
+            continue
+        if current is None or line.startswith('\\'):
+            continue  # Preamble and "\ No newline at end of file"
+        in_hunk = old_remaining > 0 or new_remaining > 0
+        if not in_hunk and line.startswith(('--- ', '+++ ')):
+            continue  # File headers after a completed hunk
+        if line.startswith('-'):
+            current['old_lines'].append(line[1:])
+            old_remaining -= 1
+        elif line.startswith('+'):
+            current['new_lines'].append(line[1:])
+            new_remaining -= 1
+        else:
+            # Context line; tolerate a missing leading space on blank lines
+            text = line[1:] if line.startswith(' ') else line
+            current['old_lines'].append(text)
+            current['new_lines'].append(text)
+            old_remaining -= 1
+            new_remaining -= 1
+    return hunks
+
+
+def _find_block(lines: List[str], block: List[str], expected: int) -> Optional[int]:
+    """Index of `block` in `lines` closest to `expected`; falls back to ignoring trailing whitespace"""
+    size = len(block)
+    for normalize in (lambda text: text, lambda text: text.rstrip()):
+        target = [normalize(text) for text in block]
+        candidates = [
+            index for index in range(len(lines) - size + 1)
+            if normalize(lines[index]) == target[0]
+            and [normalize(text) for text in lines[index:index + size]] == target
+        ]
+        if candidates:
+            return min(candidates, key=lambda index: abs(index - expected))
+    return None
+
+
+def apply_unified_diff(original: str, diff: str) -> Tuple[str, List[str], List[Dict[str, str]]]:
+    """
+    Apply a unified diff to `original`.
+
+    Returns (new_text, applied_hunk_headers, rejected_hunks). Hunks are located
+    by content, preferring the position nearest to the header line number, so
+    small line-number drift in model-written diffs is tolerated.
+    """
+    lines = original.split('\n')
+    applied = []
+    rejected = []
+    offset = 0
+
+    hunks = _parse_hunks(diff)
+    if not hunks:
+        return original, applied, [{'hunk': '', 'reason': 'No @@ hunks found in patch'}]
+
+    for hunk in hunks:
+        old_lines = hunk['old_lines']
+        expected = max(0, hunk['old_start'] - 1 + offset)
+        if old_lines:
+            index = _find_block(lines, old_lines, expected)
+        else:
+            # Pure insertion: "-N,0" means insert after line N
+            index = min(len(lines), hunk['old_start'] + offset)
+        if index is None:
+            rejected.append({'hunk': hunk['header'], 'reason': 'Context or removed lines not found in file'})
+            continue
+
+        lines[index:index + len(old_lines)] = hunk['new_lines']
+        if old_lines:
+            offset = index - (hunk['old_start'] - 1) + len(hunk['new_lines']) - len(old_lines)
+        else:
+            offset += len(hunk['new_lines'])
+        applied.append(hunk['header'])
+
+    return '\n'.join(lines), applied, rejected
+
+
+def apply_search_replace(original: str, edits: List[Dict[str, str]]) -> Tuple[str, List[str], List[Dict[str, str]]]:
+    """Apply [{search, replace}] edits in order; each search text must match exactly once"""
+    content = original
+    applied = []
+    rejected = []
+    for number, edit in enumerate(edits, 1):
+        search = (edit or {}).get('search', '')
+        replace = (edit or {}).get('replace', '')
+        label = f"edit {number}"
+        if not search:
+            rejected.append({'hunk': label, 'reason': 'Empty search text'})
+            continue
+        count = content.count(search)
+        if count == 0:
+            rejected.append({'hunk': label, 'reason': 'Search text not found'})
+        elif count > 1:
+            rejected.append({'hunk': label, 'reason': f'Search text is ambiguous ({count} matches)'})
+        else:
+            content = content.replace(search, replace, 1)
+            applied.append(label)
+    return content, applied, rejected
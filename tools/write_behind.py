@@ -0,0 +1,140 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class WriteBehindQueue:
+    """
+    Acknowledges file writes immediately and flushes them on a background thread.
+
+    Repeated writes to the same path before a flush are coalesced. Readers can
+    see not-yet-flushed content through `pending_content`, and `barrier()`
+    blocks until everything submitted so far is on disk.
+
+    fsync policies:
+      - "none":  rely on the OS page cache
+      - "batch": write a batch of temp files, fsync each, then rename them all
+      - "file":  fsync every file before it is renamed into place
+    """
+
+    FSYNC_POLICIES = ("none", "batch", "file")
+
+    def __init__(self, fsync_policy: str = "batch", batch_size: int = 64):
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync_policy}', expected one of {self.FSYNC_POLICIES}")
+        self.fsync_policy = fsync_policy
+        self.batch_size = max(1, batch_size)
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._writing: Dict[str, str] = {}
+        self._errors: List[Tuple[str, str]] = []
+        self._created_dirs = set()
+        self._condition = threading.Condition()
+        self.flushed_files = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, full_path: Path, content: str):
+        with self._condition:
+            self._pending[str(full_path)] = content
+            self._condition.notify_all()
+
+    def pending_content(self, full_path: Path) -> Optional[str]:
+        """Latest content submitted for `full_path` that may not be on disk yet"""
+        key = str(full_path)
+        with self._condition:
+            if key in self._pending:
+                return self._pending[key]
+            return self._writing.get(key)
+
+    def barrier(self, timeout: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Block until every submitted write is flushed; returns (path, error) pairs for failed writes"""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending and not self._writing, timeout=timeout)
+            errors, self._errors = self._errors, []
+            return errors
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                batch = []
+                while self._pending and len(batch) < self.batch_size:
+                    batch.append(self._pending.popitem(last=False))
+                self._writing.update(batch)
+
+            errors = self._flush(batch)
+
+            with self._condition:
+                for path, content in batch:
+                    if self._writing.get(path) is content:
+                        del self._writing[path]
+                self._errors.extend(errors)
+                self.flushed_files += len(batch) - len(errors)
+                self.batches += 1
+                self._condition.notify_all()
+
+    def _flush(self, batch: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        errors = []
+        staged = []
+        for path, content in batch:
+            try:
+                parent = os.path.dirname(path)
+                if parent not in self._created_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    self._created_dirs.add(parent)
+                fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                    if self.fsync_policy == "file":
+                        f.flush()
+                        os.fsync(f.fileno())
+                staged.append((tmp_path, path))
+            except OSError as e:
+                errors.append((path, str(e)))
+
+        if self.fsync_policy == "batch" and staged:
+            errors.extend(self._sync_files(staged))
+
+        for tmp_path, path in staged:
+            try:
+                os.replace(tmp_path, path)
+            except OSError as e:
+                errors.append((path, str(e)))
+
+        if self.fsync_policy != "none":
+            for directory in {os.path.dirname(path) for _, path in staged}:
+                self._sync_directory(directory)
+        return errors
+
+    @staticmethod
+    def _sync_files(staged: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        fsync only this batch's temp files; os.sync() would flush every dirty
+        page on the host, which is far too broad on shared NFS volumes
+        """
+        errors = []
+        for tmp_path, path in staged:
+            try:
+                with open(tmp_path, 'rb+') as f:
+                    os.fsync(f.fileno())
+            except OSError as e:
+                errors.append((path, str(e)))
+        return errors
+
+    @staticmethod
+    def _sync_directory(directory: str):
+        """Persist the renames themselves (not supported on Windows)"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils.file_analyzer import ANALYZER_VERSION
+
+
+class AnalysisCache:
+    """
+    Persistent cache of per-file analysis results (`file_info` dicts).
+
+    Entries are keyed by absolute path and validated against size, mtime and
+    content hash, so a stable tree costs at most a stat per file: a file
+    rewritten with identical content (new mtime, same SHA-256 in the output
+    manifest) is still a hit, and anything else is a miss and re-analyzed.
+    The whole cache is dropped when the analyzer version changes.
+
+    At most `max_entries` files are kept, least recently used evicted first,
+    so output roots of finished batch and daemon jobs age out.
+    """
+
+    def __init__(self, cache_path: str, max_entries: int = 20000):
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == ANALYZER_VERSION:
+            # Saved in recency order, oldest first
+            self._entries = OrderedDict(data.get('entries', {}))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _stat(full_path: str):
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None  # Not on disk (e.g. still in the in-memory output backend)
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, full_path: str, sha256: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Cached info for `full_path`. With a known content hash (from the output
+        manifest) the hash decides; otherwise an unchanged size and mtime does.
+        """
+        key = os.path.abspath(full_path)
+        stat = self._stat(full_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if sha256:
+                    valid = entry.get('sha256') == sha256
+                    if valid and stat is not None and [entry['size'], entry['mtime_ns']] != list(stat):
+                        entry['size'], entry['mtime_ns'] = stat
+                        self._dirty = True
+                else:
+                    valid = stat is not None and [entry['size'], entry['mtime_ns']] == list(stat)
+                if valid:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return dict(entry['info'])
+            self.misses += 1
+            return None
+
+    def put(self, full_path: str, info: Dict[str, Any], sha256: Optional[str] = None):
+        stat = self._stat(full_path) or (None, None)
+        key = os.path.abspath(full_path)
+        with self._lock:
+            self._entries[key] = {
+                'size': stat[0],
+                'mtime_ns': stat[1],
+                'sha256': sha256,
+                'info': dict(info)
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.cache_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': ANALYZER_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries)
+        }
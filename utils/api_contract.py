@@ -0,0 +1,334 @@
+import ast
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HTTP_METHODS = ('get', 'post', 'put', 'patch', 'delete')
+
+# fetch(url, {...}) with the call's first 300 characters scanned for `method:`
+FETCH_CALL = re.compile(r"\bfetch\(\s*(['\"`])(?P<url>.*?)\1(?P<rest>[^;]{0,300})", re.S)
+FETCH_METHOD = re.compile(r"method\s*:\s*['\"`](?P<method>\w+)['\"`]", re.I)
+# axios.get('/x'), api.post(`/x/${id}`), client.delete(...)
+CLIENT_CALL = re.compile(r"\b(?P<client>\w+)\.(?P<method>get|post|put|patch|delete)\(\s*(['\"`])(?P<url>.*?)\3", re.I | re.S)
+# axios({ url: '/x', method: 'post' }) / axios.request({...})
+CLIENT_CONFIG_CALL = re.compile(r"\baxios(?:\.request)?\(\s*\{(?P<body>[^}]*)\}", re.S)
+CONFIG_URL = re.compile(r"url\s*:\s*(['\"`])(?P<url>.*?)\1", re.S)
+TS_INTERFACE = re.compile(
+    r"\b(?:interface\s+(?P<iname>\w+)(?:<[^>{]*>)?(?:\s+extends\s+[^{]+)?|type\s+(?P<tname>\w+)(?:<[^>=]*>)?\s*=)\s*\{(?P<body>[^{}]*)\}",
+    re.S
+)
+TS_FIELD = re.compile(r"(?:^|[;,])\s*(?:readonly\s+)?['\"]?(?P<name>[A-Za-z_$][\w$]*)['\"]?\s*(?P<optional>\?)?\s*:", re.M)
+TEMPLATE_EXPR = re.compile(r"\$\{[^}]*\}")
+PATH_PARAM = re.compile(r"^(\{[^}]*\}|:\w+)$")
+
+
+def normalize_path(url: str) -> Optional[str]:
+    """Reduce a URL or route path to `/seg/{}/seg` form; None when it is not an API path"""
+    url = url.strip()
+    url = re.sub(r"^https?://[^/]+", "", url)
+    # A leading template expression is the API base URL (`${API_URL}/users`)
+    url = re.sub(r"^\$\{[^}]*\}", "", url)
+    url = url.split('?', 1)[0].split('#', 1)[0]
+    if not url.startswith('/'):
+        return None
+    url = TEMPLATE_EXPR.sub('{}', url)
+    segments = []
+    for segment in url.strip('/').split('/'):
+        if not segment:
+            continue
+        segments.append('{}' if PATH_PARAM.match(segment) or '{}' in segment else segment)
+    return '/' + '/'.join(segments)
+
+
+def _segments(path: str) -> List[str]:
+    return [segment for segment in path.strip('/').split('/') if segment]
+
+
+def paths_match(backend_path: str, frontend_path: str) -> bool:
+    """
+    Segment-wise match with `{}` as a wildcard. Either side may carry an
+    extra leading prefix (an /api mount or a base URL the extractor could not
+    see), so a match on the trailing segments counts as long as at least one
+    literal segment agrees.
+    """
+    backend, frontend = _segments(backend_path), _segments(frontend_path)
+    if not backend or not frontend:
+        return backend == frontend
+    size = min(len(backend), len(frontend))
+    if size < len(backend) and size < len(frontend):
+        return False
+    pairs = list(zip(backend[-size:], frontend[-size:]))
+    if size < max(len(backend), len(frontend)) and not any(b == f != '{}' for b, f in pairs):
+        return False
+    return all(b == f or b == '{}' or f == '{}' for b, f in pairs)
+
+
+def _literal(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        return ''.join(
+            part.value if isinstance(part, ast.Constant) else '{}'
+            for part in node.values
+        )
+    return None
+
+
+def _keyword(call: ast.Call, name: str) -> Optional[ast.AST]:
+    for keyword in call.keywords:
+        if keyword.arg == name:
+            return keyword.value
+    return None
+
+
+def _name(node: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Subscript):  # List[User] -> User
+        return _name(node.slice if not isinstance(node.slice, ast.Tuple) else node.slice.elts[0])
+    return None
+
+
+def _include_prefixes(tree: ast.AST) -> Dict[str, List[str]]:
+    """`app.include_router(users.router, prefix="/api")` -> {"users": ["/api"]}, keyed by router module name"""
+    imported: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                # from app.routers.users import router as users_router -> users
+                # from app.routers import users                          -> users
+                module = (node.module or '').rsplit('.', 1)[-1]
+                imported[alias.asname or alias.name] = module if alias.name == 'router' else alias.name
+
+    includes: Dict[str, List[str]] = {}
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and _name(node.func) == 'include_router' and node.args):
+            continue
+        target = node.args[0]
+        if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name):
+            module = imported.get(target.value.id, target.value.id)
+        elif isinstance(target, ast.Name):
+            module = imported.get(target.id, target.id)
+        else:
+            continue
+        includes.setdefault(module, []).append(_literal(_keyword(node, 'prefix')) or '')
+    return includes
+
+
+def extract_backend(files: Dict[str, str]) -> Dict[str, Any]:
+    """FastAPI routes and Pydantic models from {relative_path: source} via `ast`"""
+    routes = []
+    class_bases: Dict[str, Tuple[List[str], List[str]]] = {}
+    class_files: Dict[str, str] = {}
+    errors = []
+
+    trees = {}
+    for relative_path, source in files.items():
+        try:
+            trees[relative_path] = ast.parse(source)
+        except SyntaxError as e:
+            errors.append(f"{relative_path}: {e.msg} at line {e.lineno}")
+
+    includes: Dict[str, List[str]] = {}
+    for tree in trees.values():
+        for module, prefixes in _include_prefixes(tree).items():
+            includes.setdefault(module, []).extend(prefixes)
+
+    for relative_path, tree in trees.items():
+        module = relative_path.rsplit('/', 1)[-1][:-len('.py')]
+        mounts = includes.get(module) or ['']
+
+        # router = APIRouter(prefix="/users"); app = FastAPI()
+        prefixes: Dict[str, str] = {}
+        apps = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) and _name(node.value.func) in ('APIRouter', 'FastAPI'):
+                prefix = _literal(_keyword(node.value, 'prefix')) or ''
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        prefixes[target.id] = prefix
+                        if _name(node.value.func) == 'FastAPI':
+                            apps.add(target.id)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                fields = [
+                    item.target.id for item in node.body
+                    if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name)
+                ]
+                class_bases[node.name] = ([_name(base) for base in node.bases if _name(base)], fields)
+                class_files[node.name] = relative_path
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for decorator in node.decorator_list:
+                if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+                    continue
+                method = decorator.func.attr.lower()
+                if method not in HTTP_METHODS or not decorator.args:
+                    continue
+                path = _literal(decorator.args[0])
+                if path is None:
+                    continue
+                owner = decorator.func.value.id if isinstance(decorator.func.value, ast.Name) else ''
+                body_models = [
+                    _name(arg.annotation) for arg in node.args.args
+                    if arg.annotation is not None and _name(arg.annotation)
+                ]
+                # Routers on the app itself are not mounted anywhere else
+                for mount in ([''] if owner in apps else mounts):
+                    raw_path = mount + prefixes.get(owner, '') + path
+                    routes.append({
+                        'method': method.upper(),
+                        'path': normalize_path(raw_path) or '/',
+                        'raw_path': raw_path,
+                        'handler': node.name,
+                        'file': relative_path,
+                        'response_model': _name(_keyword(decorator, 'response_model')),
+                        'params': body_models
+                    })
+
+    # Pydantic models: BaseModel subclasses, directly or through other models
+    models: Dict[str, List[str]] = {}
+    changed = True
+    while changed:
+        changed = False
+        for name, (bases, fields) in class_bases.items():
+            if name not in models and any(base == 'BaseModel' or base in models for base in bases):
+                inherited = [field for base in bases for field in models.get(base, [])]
+                models[name] = inherited + [field for field in fields if field not in inherited]
+                changed = True
+
+    for route in routes:
+        route['params'] = [param for param in route['params'] if param in models]
+    model_files = {name: class_files[name] for name in models}
+    return {'routes': routes, 'models': models, 'model_files': model_files, 'errors': errors}
+
+
+def extract_frontend(files: Dict[str, str]) -> Dict[str, Any]:
+    """fetch/axios call sites and TypeScript interfaces from {relative_path: source} via regex"""
+    calls = []
+    interfaces: Dict[str, List[str]] = {}
+    interface_files: Dict[str, str] = {}
+
+    for relative_path, source in files.items():
+        def add_call(method: str, url: str, offset: int):
+            path = normalize_path(url)
+            if path is not None:
+                calls.append({
+                    'method': method.upper(),
+                    'path': path,
+                    'raw_url': url,
+                    'file': relative_path,
+                    'line': source.count('\n', 0, offset) + 1
+                })
+
+        for match in FETCH_CALL.finditer(source):
+            method = FETCH_METHOD.search(match.group('rest'))
+            add_call(method.group('method') if method else 'GET', match.group('url'), match.start())
+        for match in CLIENT_CALL.finditer(source):
+            add_call(match.group('method'), match.group('url'), match.start())
+        for match in CLIENT_CONFIG_CALL.finditer(source):
+            url = CONFIG_URL.search(match.group('body'))
+            if url:
+                method = FETCH_METHOD.search(match.group('body'))
+                add_call(method.group('method') if method else 'GET', url.group('url'), match.start())
+
+        for match in TS_INTERFACE.finditer(source):
+            name = match.group('iname') or match.group('tname')
+            interfaces[name] = [field.group('name') for field in TS_FIELD.finditer(match.group('body'))]
+            interface_files[name] = relative_path
+
+    return {'calls': calls, 'interfaces': interfaces, 'interface_files': interface_files}
+
+
+def diff_contract(backend: Dict[str, Any], frontend: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare the extracted contracts; `mismatches` lists problems that need fixing"""
+    mismatches = []
+    used_routes = set()
+
+    for call in frontend['calls']:
+        same_path = [index for index, route in enumerate(backend['routes']) if paths_match(route['path'], call['path'])]
+        same_method = [index for index in same_path if backend['routes'][index]['method'] == call['method']]
+        used_routes.update(same_method)
+        where = f"{call['file']}:{call['line']}"
+        if same_method:
+            continue
+        if same_path:
+            methods = sorted({backend['routes'][index]['method'] for index in same_path})
+            mismatches.append({
+                'kind': 'method_mismatch',
+                'detail': f"{where} calls {call['method']} {call['raw_url']} but the backend only accepts {', '.join(methods)}",
+                'files': [call['file']] + sorted({backend['routes'][index]['file'] for index in same_path}),
+                'symbols': sorted({backend['routes'][index]['handler'] for index in same_path})
+            })
+        else:
+            mismatches.append({
+                'kind': 'missing_route',
+                'detail': f"{where} calls {call['method']} {call['raw_url']} but no backend route matches",
+                'files': [call['file']],
+                'symbols': []
+            })
+
+    models_by_name = {name.lower(): (name, fields) for name, fields in backend['models'].items()}
+    for interface, fields in frontend['interfaces'].items():
+        model = models_by_name.get(interface.lower())
+        if model is None:
+            continue
+        model_name, model_fields = model
+        missing = [field for field in fields if field not in model_fields]
+        if missing:
+            mismatches.append({
+                'kind': 'field_mismatch',
+                'detail': f"TS interface {interface} has fields {missing} that Pydantic model {model_name} lacks",
+                'files': [frontend['interface_files'][interface], backend['model_files'][model_name]],
+                'symbols': [interface, model_name]
+            })
+
+    unused = [
+        f"{route['method']} {route['raw_path']}"
+        for index, route in enumerate(backend['routes']) if index not in used_routes
+    ]
+    return {
+        'mismatches': mismatches,
+        'unused_routes': unused,
+        'routes': len(backend['routes']),
+        'models': len(backend['models']),
+        'calls': len(frontend['calls']),
+        'interfaces': len(frontend['interfaces']),
+        'backend_errors': backend['errors']
+    }
+
+
+def check_contract(relative_paths: List[str], read: Callable[[str], str]) -> Dict[str, Any]:
+    """Extract and diff the API contract of a generated project; `read` maps a relative path to its source"""
+    backend_files, frontend_files = {}, {}
+    for relative_path in relative_paths:
+        if relative_path.startswith('backend/') and relative_path.endswith('.py'):
+            target = backend_files
+        elif relative_path.startswith('frontend/') and relative_path.endswith(('.js', '.jsx', '.ts', '.tsx')):
+            target = frontend_files
+        else:
+            continue
+        try:
+            target[relative_path] = read(relative_path)
+        except (OSError, UnicodeDecodeError):
+            continue
+    return diff_contract(extract_backend(backend_files), extract_frontend(frontend_files))
+
+
+def format_report(contract: Dict[str, Any]) -> str:
+    lines = [
+        f"Static API contract check: {contract['routes']} backend routes, {contract['models']} models, "
+        f"{contract['calls']} frontend API calls, {contract['interfaces']} TS interfaces."
+    ]
+    if contract['mismatches']:
+        lines.append(f"{len(contract['mismatches'])} mismatch(es):")
+        lines.extend(f"- [{mismatch['kind']}] {mismatch['detail']}" for mismatch in contract['mismatches'])
+    else:
+        lines.append("No mismatches between frontend API calls and backend routes.")
+    if contract['backend_errors']:
+        lines.append("Backend files that failed to parse: " + "; ".join(contract['backend_errors']))
+    if contract['unused_routes']:
+        lines.append("Backend routes not called by the frontend: " + ", ".join(contract['unused_routes']))
+    return '\n'.join(lines)
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from crewai import LLM
+from utils.llm_cache import LLMResponseCache
+from utils.tracing import span
+from utils.usage_ledger import capture_usage, install_usage_hook, record_responses
+
+
+class CachedLLM(LLM):
+    """
+    crewai LLM that serves repeated completions from an LLMResponseCache.
+
+    Calls that pass `available_functions` are never cached: litellm executes
+    those functions itself, so replaying the answer would skip side effects.
+    ReAct-style tool use is safe because crewai runs the tools after the call.
+    """
+
+    def __init__(self, *args, cache: Optional[LLMResponseCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+        install_usage_hook()
+
+    def call(self, messages: Union[str, List[Dict[str, str]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             **kwargs) -> Any:
+        with span("llm.call", "llm", model=self.model, cache_hit=False) as llm_span:
+            if self.cache is None or available_functions:
+                return self._call_model(messages, tools, callbacks, available_functions, **kwargs)
+
+            key = self.cache.make_key(self.model, self.temperature, messages, tools, getattr(self, 'stop', None))
+            cached = self.cache.get(key)
+            if cached is not None:
+                llm_span.set(cache_hit=True)
+                return cached
+
+            response = self._call_model(messages, tools, callbacks, available_functions, **kwargs)
+            if isinstance(response, str) and response.strip():
+                self.cache.put(key, response, model=self.model)
+            return response
+
+    def _call_model(self, messages, tools, callbacks, available_functions, **kwargs) -> Any:
+        """Perform the real completion request (cache miss or uncacheable call)"""
+        response, _ = self._metered_call(messages, tools, callbacks, available_functions, **kwargs)
+        return response
+
+    def _metered_call(self, messages, tools, callbacks, available_functions, **kwargs) -> Tuple[Any, List[Any]]:
+        """Perform the completion request and meter its usage; returns (response, usage per response)"""
+        with capture_usage() as usages:
+            try:
+                response = super().call(messages, tools=tools, callbacks=callbacks,
+                                        available_functions=available_functions, **kwargs)
+            except Exception as e:
+                record_responses(self.model, usages, error=e)
+                raise
+        record_responses(self.model, usages)
+        return response, usages
@@ -0,0 +1,315 @@
+import ast
+import os
+import posixpath
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+PYTHON_EXTENSIONS = ('.py',)
+TS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs')
+TS_RESOLVE_SUFFIXES = ('', '.ts', '.tsx', '.js', '.jsx', '/index.ts', '/index.tsx', '/index.js', '/index.jsx')
+
+# Comments, strings (including template literals) and words; everything else is punctuation
+TS_TOKEN = re.compile(
+    r"(?P<comment>//[^\n]*|/\*.*?\*/)"
+    r"|(?P<string>'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|`(?:\\.|[^`\\])*`)"
+    r"|(?P<word>[A-Za-z_$][\w$]*)"
+    r"|(?P<punct>[{}(),;*=])",
+    re.S
+)
+TS_DECLARATIONS = ('function', 'class', 'const', 'let', 'var', 'interface', 'type', 'enum')
+
+
+def _ts_tokens(source: str) -> List[tuple]:
+    """(kind, text, line) tokens with comments dropped"""
+    tokens = []
+    line = 1
+    position = 0
+    for match in TS_TOKEN.finditer(source):
+        line += source.count('\n', position, match.start())
+        position = match.start()
+        kind = match.lastgroup
+        if kind != 'comment':
+            tokens.append((kind, match.group(), line))
+    return tokens
+
+
+def parse_typescript(source: str) -> Dict[str, Any]:
+    """Exported symbols and import specifiers of a JS/TS module from its token stream"""
+    tokens = _ts_tokens(source)
+    symbols = []
+    imports = []
+    for index, (kind, text, line) in enumerate(tokens):
+        following = tokens[index + 1:index + 6]
+        if kind == 'word' and text == 'import':
+            # import x from 'y' / import { a } from 'y' / import 'y' / import('y')
+            for next_kind, next_text, _ in tokens[index + 1:index + 40]:
+                if next_kind == 'string':
+                    imports.append(next_text[1:-1])
+                    break
+                if next_kind == 'punct' and next_text == ';':
+                    break
+        elif kind == 'word' and text == 'require' and len(following) >= 2 and following[1][0] == 'string':
+            imports.append(following[1][1][1:-1])
+        elif kind == 'word' and text == 'export':
+            words = [token for token in following if token[0] == 'word']
+            if following and following[0][1] == '{':
+                # export { a, b as c } [from 'x']
+                renamed = False
+                for next_kind, next_text, _ in tokens[index + 2:index + 60]:
+                    if next_text == '}':
+                        break
+                    if next_kind != 'word':
+                        continue
+                    if next_text == 'as':
+                        renamed = True
+                    elif renamed:
+                        symbols[-1]['name'] = next_text  # `b as c` exports c
+                        renamed = False
+                    else:
+                        symbols.append({'name': next_text, 'kind': 'export', 'line': line})
+                continue
+            if words and words[0][1] == 'default':
+                words = words[1:]
+                if not words or words[0][1] not in TS_DECLARATIONS:
+                    symbols.append({'name': 'default', 'kind': 'default', 'line': line})
+                    continue
+            if words and words[0][1] == 'async':
+                words = words[1:]
+            if len(words) >= 2 and words[0][1] in TS_DECLARATIONS:
+                symbols.append({'name': words[1][1], 'kind': words[0][1], 'line': line})
+    # `export ... from 'x'` re-exports are dependencies too
+    for index, (kind, text, _) in enumerate(tokens[:-1]):
+        if kind == 'word' and text == 'from' and tokens[index + 1][0] == 'string':
+            specifier = tokens[index + 1][1][1:-1]
+            if specifier not in imports:
+                imports.append(specifier)
+    return {'symbols': symbols, 'imports': imports}
+
+
+def parse_python(source: str) -> Dict[str, Any]:
+    """Top-level functions/classes (with methods) and imports of a Python module"""
+    tree = ast.parse(source)
+    symbols = []
+    imports = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            kind = 'class' if isinstance(node, ast.ClassDef) else 'function'
+            symbols.append({'name': node.name, 'kind': kind, 'line': node.lineno,
+                            'end_line': getattr(node, 'end_lineno', node.lineno)})
+            if isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        symbols.append({'name': f"{node.name}.{item.name}", 'kind': 'method', 'line': item.lineno,
+                                        'end_line': getattr(item, 'end_lineno', item.lineno)})
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = '.' * node.level + (node.module or '')
+            imports.append(module)
+            # `from pkg import module` may name submodules
+            imports.extend(f"{module}.{alias.name}" if node.module else module + alias.name for alias in node.names)
+    return {'symbols': symbols, 'imports': imports}
+
+
+class CodeIndex:
+    """
+    Symbol, import and dependency index over a generated project.
+
+    Python files are indexed with `ast`, JS/TS files with a small tokenizer.
+    Attached to an OutputManifest, the index re-parses only the file named in
+    each write event and re-resolves dependency edges, so prompts can pull the
+    outline or source of just the files and symbols a check needs.
+    """
+
+    def __init__(self, output_dir: str = "", backend: Any = None):
+        self.output_dir = output_dir
+        self.backend = backend
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._symbols: Dict[str, List[tuple]] = {}
+        self._manifest = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def indexable(relative_path: str) -> bool:
+        return relative_path.endswith(PYTHON_EXTENSIONS + TS_EXTENSIONS)
+
+    def _read(self, relative_path: str) -> Optional[str]:
+        full_path = os.path.join(self.output_dir, relative_path)
+        try:
+            if self.backend is not None:
+                return self.backend.read(full_path)
+            with open(full_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def update(self, relative_path: str, source: Optional[str] = None):
+        """(Re)index one file; `source` is read through the backend when not given"""
+        if not self.indexable(relative_path):
+            return
+        if source is None:
+            source = self._read(relative_path)
+            if source is None:
+                return
+        try:
+            if relative_path.endswith(PYTHON_EXTENSIONS):
+                parsed = parse_python(source)
+            else:
+                parsed = parse_typescript(source)
+            parsed['error'] = None
+        except SyntaxError as e:
+            parsed = {'symbols': [], 'imports': [], 'error': f"{e.msg} at line {e.lineno}"}
+
+        with self._lock:
+            self._remove_symbols(relative_path)
+            self._files[relative_path] = parsed
+            for symbol in parsed['symbols']:
+                short_name = symbol['name'].rsplit('.', 1)[-1]
+                self._symbols.setdefault(short_name, []).append((relative_path, symbol))
+
+    def _remove_symbols(self, relative_path: str):
+        previous = self._files.get(relative_path)
+        if previous is None:
+            return
+        for symbol in previous['symbols']:
+            short_name = symbol['name'].rsplit('.', 1)[-1]
+            remaining = [entry for entry in self._symbols.get(short_name, []) if entry[0] != relative_path]
+            if remaining:
+                self._symbols[short_name] = remaining
+            else:
+                self._symbols.pop(short_name, None)
+
+    def on_write(self, event: Dict[str, Any]):
+        """OutputManifest subscriber"""
+        self.update(event['path'], event.get('content'))
+
+    def attach(self, manifest):
+        """Index the files already in `manifest`, then follow its write events"""
+        self.detach()
+        self._manifest = manifest
+        manifest.subscribe(self.on_write)
+        for relative_path in manifest.list_files():
+            if relative_path not in self._files:
+                self.update(relative_path)
+
+    def detach(self):
+        if self._manifest is not None:
+            self._manifest.unsubscribe(self.on_write)
+            self._manifest = None
+
+    # Dependency resolution is done on demand so edges always reflect the current file set
+
+    def _resolve_python(self, relative_path: str, module: str) -> Optional[str]:
+        side = relative_path.split('/', 1)[0]
+        if module.startswith('.'):
+            level = len(module) - len(module.lstrip('.'))
+            base = posixpath.dirname(relative_path)
+            for _ in range(level - 1):
+                base = posixpath.dirname(base)
+            stem = posixpath.join(base, module.lstrip('.').replace('.', '/'))
+            candidates = [f"{stem}.py", f"{stem}/__init__.py"]
+            return next((path for path in candidates if path in self._files), None)
+        stem = module.replace('.', '/')
+        matches = [
+            path for path in self._files
+            if path.startswith(side + '/') and (path.endswith(f"/{stem}.py") or path.endswith(f"/{stem}/__init__.py"))
+        ]
+        return min(matches, key=len) if matches else None
+
+    def _resolve_typescript(self, relative_path: str, specifier: str) -> Optional[str]:
+        side = relative_path.split('/', 1)[0]
+        if specifier.startswith('.'):
+            stem = posixpath.normpath(posixpath.join(posixpath.dirname(relative_path), specifier))
+        elif specifier.startswith('@/'):
+            stem = f"{side}/src/{specifier[2:]}"
+        else:
+            return None  # Package import
+        return next((stem + suffix for suffix in TS_RESOLVE_SUFFIXES if stem + suffix in self._files), None)
+
+    def dependencies(self, relative_path: str) -> List[str]:
+        with self._lock:
+            entry = self._files.get(relative_path)
+            if entry is None:
+                return []
+            resolve = self._resolve_python if relative_path.endswith(PYTHON_EXTENSIONS) else self._resolve_typescript
+            deps = []
+            for specifier in entry['imports']:
+                target = resolve(relative_path, specifier)
+                if target and target != relative_path and target not in deps:
+                    deps.append(target)
+            return deps
+
+    def dependency_graph(self) -> Dict[str, List[str]]:
+        with self._lock:
+            return {path: self.dependencies(path) for path in self._files}
+
+    def dependents(self, relative_path: str) -> List[str]:
+        with self._lock:
+            return [path for path in self._files if relative_path in self.dependencies(path)]
+
+    def find_symbol(self, name: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{'path': path, **symbol} for path, symbol in self._symbols.get(name, [])]
+
+    def files(self) -> List[str]:
+        with self._lock:
+            return list(self._files)
+
+    def outline(self, relative_paths: Iterable[str]) -> str:
+        """Compact symbol/dependency outline of the given files"""
+        lines = []
+        with self._lock:
+            for relative_path in relative_paths:
+                entry = self._files.get(relative_path)
+                if entry is None:
+                    continue
+                lines.append(f"{relative_path}:")
+                if entry['error']:
+                    lines.append(f"  ! syntax error: {entry['error']}")
+                for symbol in entry['symbols']:
+                    lines.append(f"  {symbol['kind']} {symbol['name']} (line {symbol['line']})")
+                deps = self.dependencies(relative_path)
+                if deps:
+                    lines.append(f"  imports: {', '.join(deps)}")
+        return '\n'.join(lines)
+
+    def symbol_source(self, relative_path: str, name: str) -> Optional[str]:
+        """Source of one symbol (Python symbols carry end lines; TS exports get a 40-line window)"""
+        with self._lock:
+            entry = self._files.get(relative_path)
+            symbol = next((s for s in (entry or {}).get('symbols', []) if s['name'] == name), None)
+        if symbol is None:
+            return None
+        source = self._read(relative_path)
+        if source is None:
+            return None
+        lines = source.split('\n')
+        end = symbol.get('end_line') or min(len(lines), symbol['line'] + 40)
+        return '\n'.join(lines[symbol['line'] - 1:end])
+
+    def snippets(self, relative_paths: Iterable[str], symbols: Iterable[str] = (), max_chars: int = 6000) -> str:
+        """
+        Context for a check: the outline of `relative_paths` plus their direct
+        dependencies, followed by the source of the named symbols, cut at `max_chars`.
+        """
+        paths: List[str] = []
+        seen: Set[str] = set()
+        for relative_path in relative_paths:
+            for path in [relative_path] + self.dependencies(relative_path):
+                if path not in seen:
+                    seen.add(path)
+                    paths.append(path)
+
+        parts = [self.outline(paths)]
+        for name in symbols:
+            for match in self.find_symbol(name):
+                source = self.symbol_source(match['path'], match['name'])
+                if source:
+                    parts.append(f"# {match['path']} :: {match['name']}\n{source}")
+
+        context = '\n\n'.join(part for part in parts if part)
+        if len(context) > max_chars:
+            context = context[:max_chars] + "\n... (truncated)"
+        return context
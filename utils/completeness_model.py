@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import Counter
+from typing import Any, Dict, List
+
+from utils.file_analyzer import analyze_file, analyze_text
+from utils.path_classifier import PathClassifier
+
+
+class CompletenessModel:
+    """
+    Project completeness score maintained incrementally from file writes.
+
+    Keeps per-side category counts and the number of implemented files, so
+    `score()` and `missing_patterns()` cost O(1) at any point in the pipeline.
+    Feed it with `update()` or attach it to an OutputManifest, whose write
+    events carry the new content. The scoring rules are those of the review
+    stage: 10 points per backend/frontend category (max 40 each) plus up to
+    20 for more than 5 or 10 implemented files.
+    """
+
+    SIDES = ('backend', 'frontend')
+
+    def __init__(self, classifiers: Dict[str, PathClassifier], output_dir: str = "", backend: Any = None):
+        self.classifiers = classifiers
+        self.output_dir = output_dir
+        self.backend = backend
+        self._files: Dict[str, tuple] = {}  # path -> (side, category, implemented)
+        self._categories = {side: Counter() for side in self.SIDES}
+        self._implemented = 0
+        self._manifest = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_implemented(info: Dict[str, Any]) -> bool:
+        return bool(info.get('has_content')) and not info.get('is_placeholder')
+
+    def update(self, relative_path: str, info: Dict[str, Any]):
+        """Add or replace one file's contribution"""
+        side = relative_path.split('/', 1)[0]
+        if side not in self.classifiers:
+            return
+        category = self.classifiers[side].classify(relative_path)
+        implemented = self.is_implemented(info)
+
+        with self._lock:
+            previous = self._files.get(relative_path)
+            if previous is not None:
+                old_side, old_category, old_implemented = previous
+                self._categories[old_side][old_category] -= 1
+                if not self._categories[old_side][old_category]:
+                    del self._categories[old_side][old_category]
+                self._implemented -= old_implemented
+            self._files[relative_path] = (side, category, implemented)
+            self._categories[side][category] += 1
+            self._implemented += implemented
+
+    def on_write(self, event: Dict[str, Any]):
+        """OutputManifest subscriber: analyze the written content and update the counts"""
+        if event.get('content') is not None:
+            info = analyze_text(event['content'])
+        else:
+            info = analyze_file(os.path.join(self.output_dir, event['path']), self.backend)
+        self.update(event['path'], info)
+
+    def attach(self, manifest):
+        """Seed from the files already in `manifest`, then follow its write events"""
+        self.detach()
+        self._manifest = manifest
+        manifest.subscribe(self.on_write)
+        for relative_path in manifest.list_files():
+            if relative_path.split('/', 1)[0] in self.classifiers and relative_path not in self._files:
+                self.update(relative_path, analyze_file(os.path.join(self.output_dir, relative_path), self.backend))
+
+    def detach(self):
+        if self._manifest is not None:
+            self._manifest.unsubscribe(self.on_write)
+            self._manifest = None
+
+    def category_count(self, side: str, category: str) -> int:
+        return self._categories[side][category]
+
+    def implementation_score(self) -> int:
+        if self._implemented > 10:
+            return 20
+        if self._implemented > 5:
+            return 10
+        return 0
+
+    def score(self) -> int:
+        with self._lock:
+            return (
+                min(len(self._categories['backend']) * 10, 40)
+                + min(len(self._categories['frontend']) * 10, 40)
+                + self.implementation_score()
+            )
+
+    def missing_patterns(self) -> List[str]:
+        with self._lock:
+            backend = self._categories['backend']
+            frontend = self._categories['frontend']
+            missing = []
+            if not backend['routers'] and not backend['application']:
+                missing.append("Backend lacks API routing layer")
+            if not backend['services'] and not backend['crud']:
+                missing.append("Backend lacks business logic layer")
+            if not frontend['components']:
+                missing.append("Frontend lacks UI components")
+            if not frontend['pages'] and frontend['components'] < 3:
+                missing.append("Frontend lacks sufficient component structure")
+            if not frontend['services']:
+                missing.append("Frontend lacks API service layer")
+            return missing
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'completeness_score': self.score(),
+            'missing_patterns': self.missing_patterns(),
+            'implemented_files': self._implemented,
+            'files': len(self._files)
+        }
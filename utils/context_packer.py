@@ -0,0 +1,165 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Lines worth keeping when a section is summarized: headings, list items,
+# numbered steps, key: value lines and anything naming an HTTP endpoint
+KEY_LINE = re.compile(r"^\s*(?:#{1,6}\s|[-*•]\s|\d+[.)]\s|\*\*|[A-Za-z][\w /-]{0,40}:\s|.*\b(?:GET|POST|PUT|PATCH|DELETE)\b)")
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """Token count from litellm's tokenizer for `model`, or ~4 characters per token without it"""
+    if not text:
+        return 0
+    if model:
+        try:
+            import litellm
+            return litellm.token_counter(model=model, text=text)
+        except Exception:
+            pass
+    return max(1, len(text) // 4)
+
+
+class Section:
+    """
+    A variable part of a prompt. Lower `priority` is more important; sections
+    are shrunk from the least important up. `summary` is an optional cheaper
+    rendering tried before extractive summarizing and truncation, and
+    `min_tokens` is the floor a section is never cut below. A `keep_whole`
+    section is never shrunk: its floor is its own size.
+    """
+
+    def __init__(self, name: str, text: str, priority: int, summary: Optional[str] = None,
+                 min_tokens: int = 0, keep_whole: bool = False):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.summary = summary
+        self.min_tokens = min_tokens
+        self.keep_whole = keep_whole
+
+
+class ContextPacker:
+    """
+    Fits prompt sections into a per-task token budget.
+
+    `fixed_tokens` (the task's instructions) are reserved first. If the
+    sections do not fit in the rest, the lowest-priority ones are replaced by
+    their summary, then by their key lines, then truncated head-and-tail, until
+    the prompt fits. `pack` returns a report of every decision alongside the
+    packed sections, and warns when a priority-0 section had to be shrunk or
+    the prompt still exceeds the budget.
+    """
+
+    def __init__(self, budget: int, model: str = ""):
+        self.budget = budget
+        self.model = model
+
+    def count(self, text: str) -> int:
+        return count_tokens(text, self.model)
+
+    @staticmethod
+    def _key_lines(text: str) -> str:
+        return '\n'.join(line for line in text.split('\n') if KEY_LINE.match(line))
+
+    def _truncate(self, text: str, target_tokens: int) -> str:
+        if target_tokens <= 0:
+            return ""
+        # Characters per token measured on this text, so the cut lands close to the target
+        ratio = len(text) / max(1, self.count(text))
+        keep = int(target_tokens * ratio)
+        if keep >= len(text):
+            return text
+        truncated = text
+        # The ratio is an average, so re-cut a few times if the result still overshoots
+        for _ in range(4):
+            head = text[:int(keep * 0.7)]
+            tail = text[len(text) - int(keep * 0.3):] if keep > 200 else ""
+            omitted = len(text) - len(head) - len(tail)
+            truncated = f"{head}\n... [{omitted} characters omitted to fit the context budget] ...\n{tail}".rstrip()
+            tokens = self.count(truncated)
+            if tokens <= target_tokens:
+                break
+            keep = int(keep * target_tokens / tokens) - 1
+        return truncated
+
+    def _shrink(self, section: Section, target_tokens: int) -> Tuple[str, str]:
+        """Return (text, action) for `section` fitted into `target_tokens`"""
+        candidates = []
+        if section.summary is not None:
+            candidates.append((section.summary, 'summarized'))
+        key_lines = self._key_lines(section.text)
+        if key_lines and key_lines != section.text:
+            candidates.append((key_lines, 'summarized'))
+        for text, action in candidates:
+            if self.count(text) <= target_tokens:
+                return text, action
+        source = candidates[0][0] if candidates else section.text
+        if target_tokens <= 0:
+            return "", 'dropped'
+        return self._truncate(source, target_tokens), 'truncated'
+
+    def pack(self, sections: List[Section], fixed_tokens: int = 0,
+             task: str = "") -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Fit `sections` into the budget; returns ({section name: text to embed}, packing report)"""
+        tokens = {section.name: self.count(section.text) for section in sections}
+        packed = {section.name: section.text for section in sections}
+        actions = {section.name: 'kept' for section in sections}
+        available = self.budget - fixed_tokens
+        excess = sum(tokens.values()) - available
+
+        # Least important first; ties shrink the larger section first
+        for section in sorted(sections, key=lambda s: (-s.priority, -tokens[s.name])):
+            if excess <= 0:
+                break
+            current = tokens[section.name]
+            floor = current if section.keep_whole else section.min_tokens
+            target = max(floor, current - excess)
+            if target >= current:
+                continue
+            text, action = self._shrink(section, target)
+            new_tokens = self.count(text)
+            packed[section.name] = text
+            actions[section.name] = action
+            excess -= current - new_tokens
+
+        for section in sections:
+            if section.priority == 0 and actions[section.name] != 'kept':
+                print(f"⚠️ {task or 'prompt'}: essential section '{section.name}' {actions[section.name]} "
+                      f"from {tokens[section.name]} tokens to fit the context budget of {self.budget}")
+        if excess > 0:
+            print(f"⚠️ {task or 'prompt'}: prompt exceeds the context budget of {self.budget} by {excess} tokens")
+
+        total_before = sum(tokens.values())
+        report = {
+            'task': task,
+            'budget': self.budget,
+            'fixed_tokens': fixed_tokens,
+            'tokens_before': fixed_tokens + total_before,
+            'tokens_after': fixed_tokens + sum(self.count(text) for text in packed.values()),
+            'fits': excess <= 0,
+            'sections': [
+                {
+                    'name': section.name,
+                    'priority': section.priority,
+                    'tokens': tokens[section.name],
+                    'packed_tokens': self.count(packed[section.name]) if actions[section.name] != 'kept' else tokens[section.name],
+                    'action': actions[section.name]
+                }
+                for section in sections
+            ]
+        }
+        return packed, report
+
+
+def pack_prompt(packer: Optional[ContextPacker], render, sections: List[Section],
+                task: str = "") -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Render a prompt whose variable parts are `sections`. `render(texts)` builds
+    the prompt from {section name: text}; without a packer every section is
+    embedded whole and no report is produced.
+    """
+    if packer is None:
+        return render({section.name: section.text for section in sections}), None
+    fixed_tokens = packer.count(render({section.name: "" for section in sections}))
+    packed, report = packer.pack(sections, fixed_tokens, task)
+    return render(packed), report
@@ -0,0 +1,148 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from utils.cached_llm import CachedLLM
+from utils.llm_cache import LLMResponseCache
+from utils.rate_limiter import RateLimiter
+from utils.tracing import span
+from utils.usage_ledger import usage_from_response
+
+
+class SharedLLM(CachedLLM):
+    """
+    LLM instance shared between agents. Each real request is admitted by the
+    registry's rate limiter and then waits for an in-flight slot; a request
+    the provider rejects with a 429 is retried on its own, so the agent turns
+    that already succeeded are not repeated.
+    """
+
+    def __init__(self, *args, registry: "LLMClientRegistry" = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.registry = registry
+
+    def _call_model(self, messages, tools, callbacks, available_functions, **kwargs) -> Any:
+        limiter = self.registry.rate_limiter if self.registry is not None else None
+        if limiter is None:
+            response, _ = self._request(messages, tools, callbacks, available_functions, **kwargs)
+            return response
+
+        estimated_tokens = self._estimate_tokens(messages)
+        response, usages = limiter.run(
+            self.model,
+            lambda: self._request(messages, tools, callbacks, available_functions, **kwargs),
+            estimated_tokens=estimated_tokens
+        )
+        # Reconcile the reservation with what the request actually consumed
+        if usages:
+            used_tokens = sum(usage_from_response(usage)['total_tokens'] for usage in usages)
+            limiter.record_usage(self.model, token_delta=used_tokens - estimated_tokens,
+                                 extra_requests=len(usages) - 1)
+        return response
+
+    def _request(self, messages, tools, callbacks, available_functions, **kwargs):
+        if self.registry is None:
+            return self._metered_call(messages, tools, callbacks, available_functions, **kwargs)
+        with self.registry.in_flight_slot():
+            return self._metered_call(messages, tools, callbacks, available_functions, **kwargs)
+
+    def _estimate_tokens(self, messages) -> int:
+        """Rough prompt size (~4 chars per token) plus the registry's completion allowance"""
+        if isinstance(messages, str):
+            prompt_chars = len(messages)
+        else:
+            prompt_chars = sum(len(str(message.get('content') or '')) for message in messages)
+        return prompt_chars // 4 + self.registry.completion_tokens
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of LLM clients shared by every agent.
+
+    One client is built per (model, temperature, cached) combination, every
+    client sends its requests over one keep-alive pooled HTTP session (passed
+    to litellm as the per-call `client`, which the gemini provider honours,
+    unlike the global `litellm.client_session`), and the number of
+    concurrent in-flight requests across all agents is capped. With a
+    `rate_limiter`, every request reserves its estimated prompt size plus
+    `completion_tokens` from the model budget before it is sent.
+    """
+
+    def __init__(self, max_in_flight: int = 4, max_connections: int = 10,
+                 keepalive_expiry: float = 60.0, rate_limiter: Optional[RateLimiter] = None,
+                 completion_tokens: int = 0):
+        self.max_in_flight = max_in_flight
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.rate_limiter = rate_limiter
+        self.completion_tokens = completion_tokens
+        self._clients: Dict[Tuple[str, Any, bool], SharedLLM] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._in_flight = 0
+        self.peak_in_flight = 0
+        self._http_client = None
+        self._session_configured = False
+
+    def get(self, model: str, temperature: Any, api_key: str,
+            cache: Optional[LLMResponseCache] = None) -> SharedLLM:
+        key = (model, temperature, cache is not None)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                http_client = self._pooled_http_client()
+                # Extra LLM kwargs are forwarded to litellm.completion by crewai
+                extra = {'client': http_client} if http_client is not None else {}
+                client = SharedLLM(
+                    model=model,
+                    temperature=temperature,
+                    api_key=api_key,
+                    cache=cache,
+                    registry=self,
+                    **extra
+                )
+                self._clients[key] = client
+            return client
+
+    def _pooled_http_client(self):
+        """The litellm HTTPHandler over one keep-alive connection pool, shared by every client"""
+        if self._session_configured:
+            return self._http_client
+        self._session_configured = True
+        try:
+            import httpx
+            from litellm.llms.custom_httpx.http_handler import HTTPHandler
+        except ImportError:
+            return None
+
+        self._http_client = HTTPHandler(client=httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(600.0, connect=10.0)
+        ))
+        return self._http_client
+
+    @contextmanager
+    def in_flight_slot(self):
+        """Hold one of the `max_in_flight` request slots for the duration of a call"""
+        if not self._slots.acquire(blocking=False):
+            with span("llm.slot_wait", "wait", max_in_flight=self.max_in_flight):
+                self._slots.acquire()
+        with self._lock:
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._clients),
+            "max_in_flight": self.max_in_flight,
+            "peak_in_flight": self.peak_in_flight
+        }
@@ -0,0 +1,59 @@
+import re
+from typing import List, Sequence, Tuple
+
+CategoryRules = Sequence[Tuple[str, Sequence[str]]]
+
+
+class PathClassifier:
+    """
+    Assigns each path the first category whose keywords occur in it.
+
+    All keywords of the ordered rule table are compiled into one alternation,
+    listed in rule order so that where keywords of several rules start at the
+    same position, the highest-priority one is reported. A path is scanned
+    once with `finditer`, and the matched rule with the lowest index wins, so
+    the cost stays one pass over the path however many rules there are.
+    `classify_many` scans a whole path list in one pass over the
+    newline-joined paths.
+    """
+
+    def __init__(self, rules: CategoryRules, default: str = "other"):
+        self.default = default
+        self._categories = {}
+        alternatives = []
+        seen = set()
+        for index, (category, keywords) in enumerate(rules):
+            group = f"c{index}"
+            self._categories[group] = index
+            # A keyword already claimed by an earlier rule can never decide a later one
+            unique = [keyword for keyword in keywords if keyword not in seen]
+            seen.update(unique)
+            if unique:
+                alternatives.append(f"(?P<{group}>{'|'.join(re.escape(keyword) for keyword in unique)})")
+        self._names = [category for category, _ in rules]
+        # Zero-width lookahead so keywords overlapping a previous match are still seen
+        keyword_pattern = f"(?=(?:{'|'.join(alternatives)}))" if alternatives else "(?!)"
+        self._pattern = re.compile(f"(?P<newline>\\n)|{keyword_pattern}")
+
+    def _scan(self, blob: str, count: int) -> List[str]:
+        best = [len(self._names)] * count
+        position = 0
+        for match in self._pattern.finditer(blob):
+            group = match.lastgroup
+            if group == 'newline':
+                position += 1
+            else:
+                index = self._categories[group]
+                if index < best[position]:
+                    best[position] = index
+        return [self._names[index] if index < len(self._names) else self.default for index in best]
+
+    def classify(self, path: str) -> str:
+        return self._scan(path.replace('\n', ' '), 1)[0]
+
+    def classify_many(self, paths: Sequence[str]) -> List[str]:
+        """Classify every path in one pass; results are in input order"""
+        if not paths:
+            return []
+        blob = '\n'.join(path.replace('\n', ' ') for path in paths)
+        return self._scan(blob, len(paths))
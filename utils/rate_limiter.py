@@ -0,0 +1,220 @@
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from utils.tracing import span
+
+
+class _ModelBudget:
+    """Request and token buckets for a single model"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm_ceiling = float(rpm)
+        self.rpm = float(rpm)
+        self.tpm = float(tpm)
+        self.requests_available = float(rpm)
+        self.tokens_available = float(tpm)
+        self.blocked_until = 0.0
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.updated_at = now
+        self.requests_available = min(self.rpm, self.requests_available + elapsed * self.rpm / 60.0)
+        self.tokens_available = min(self.tpm, self.tokens_available + elapsed * self.tpm / 60.0)
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        """Seconds until one request of `tokens` fits into both buckets"""
+        self.refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        tokens = min(tokens, self.tpm)
+        request_wait = max(0.0, 1.0 - self.requests_available) * 60.0 / self.rpm
+        token_wait = max(0.0, tokens - self.tokens_available) * 60.0 / self.tpm
+        return max(request_wait, token_wait)
+
+    def consume(self, requests: float, tokens: float):
+        self.requests_available -= requests
+        self.tokens_available -= min(tokens, self.tpm)
+
+
+class RateLimiter:
+    """
+    Per-model token-bucket limiter for requests-per-minute and tokens-per-minute.
+
+    Callers only block when the next request would exceed the current budget.
+    When the provider answers with a 429 the budget for that model is lowered
+    and paused until the Retry-After hint expires, then recovers additively on
+    every successful call.
+    """
+
+    RETRY_AFTER_PATTERNS = [
+        re.compile(r'"?retryDelay"?\s*:\s*"?(\d+(?:\.\d+)?)s', re.IGNORECASE),
+        re.compile(r'retry (?:in|after) (\d+(?:\.\d+)?)\s*s', re.IGNORECASE),
+    ]
+
+    def __init__(self, limits: Dict[str, Dict[str, int]], default_limit: Dict[str, int],
+                 max_retries: int = 3, backoff_factor: float = 0.5):
+        self.limits = limits
+        self.default_limit = default_limit
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._budgets: Dict[str, _ModelBudget] = {}
+        self._lock = threading.Lock()
+        self.total_wait_seconds = 0.0
+        self.rate_limit_hits = 0
+
+    def _budget(self, model: str) -> _ModelBudget:
+        budget = self._budgets.get(model)
+        if budget is None:
+            limit = self.limits.get(model, self.default_limit)
+            budget = _ModelBudget(limit["rpm"], limit["tpm"])
+            self._budgets[model] = budget
+        return budget
+
+    def acquire(self, model: str, estimated_tokens: int = 0) -> float:
+        """Block until a request of `estimated_tokens` fits the model budget; return seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                budget = self._budget(model)
+                wait = budget.wait_time(estimated_tokens, time.monotonic())
+                if wait <= 0:
+                    budget.consume(1, estimated_tokens)
+                    self.total_wait_seconds += waited
+                    return waited
+
+            print(f"⏳ Rate limit budget for {model} exhausted, waiting {wait:.1f}s...")
+            with span("rate_limit_wait", "wait", model=model, seconds=round(wait, 3)):
+                time.sleep(wait)
+            waited += wait
+
+    def concurrency_limit(self, model: str, ceiling: int) -> int:
+        """How many stages may call `model` at once: serialize while the budget is throttled"""
+        with self._lock:
+            budget = self._budget(model)
+            if time.monotonic() < budget.blocked_until or budget.rpm < budget.rpm_ceiling:
+                return 1
+            return max(1, ceiling)
+
+    def record_usage(self, model: str, token_delta: int = 0, extra_requests: int = 0):
+        """Correct the buckets once the real cost of a call is known"""
+        with self._lock:
+            budget = self._budget(model)
+            budget.refill(time.monotonic())
+            budget.consume(extra_requests, token_delta)
+
+    def record_success(self, model: str):
+        with self._lock:
+            budget = self._budget(model)
+            budget.rpm = min(budget.rpm_ceiling, budget.rpm + 1)
+
+    def record_rate_limit(self, model: str, retry_after: Optional[float] = None,
+                          limit_requests: Optional[int] = None, limit_tokens: Optional[int] = None):
+        """Learn from a 429: shrink the budget and pause the model until Retry-After"""
+        with self._lock:
+            budget = self._budget(model)
+            now = time.monotonic()
+            budget.refill(now)
+
+            if limit_requests:
+                budget.rpm_ceiling = float(limit_requests)
+                budget.rpm = float(limit_requests)
+            else:
+                budget.rpm = max(1.0, budget.rpm * self.backoff_factor)
+            if limit_tokens:
+                budget.tpm = float(limit_tokens)
+
+            if retry_after is None:
+                retry_after = 60.0 / budget.rpm
+            budget.blocked_until = max(budget.blocked_until, now + retry_after)
+            budget.requests_available = 0.0
+            budget.tokens_available = min(budget.tokens_available, 0.0)
+            self.rate_limit_hits += 1
+
+    def run(self, model: str, fn: Callable[[], Any], estimated_tokens: int = 0) -> Any:
+        """Call `fn` within the model budget, retrying on rate-limit errors"""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(model, estimated_tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                if not self.is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                retry_after = self.parse_retry_after(e)
+                limit_requests, limit_tokens = self._parse_limit_headers(e)
+                self.record_rate_limit(model, retry_after, limit_requests, limit_tokens)
+                hint = f"{retry_after:.0f}s" if retry_after is not None else "backoff"
+                print(f"⚠️ Rate limited by {model} (attempt {attempt + 1}/{self.max_retries + 1}), retrying after {hint}...")
+                continue
+
+            self.record_success(model)
+            return result
+
+    @staticmethod
+    def _iter_causes(error: BaseException):
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            yield error
+            error = error.__cause__ or error.__context__
+
+    @classmethod
+    def is_rate_limit_error(cls, error: BaseException) -> bool:
+        """A 429 status or a rate-limit exception type (e.g. litellm.RateLimitError) anywhere in the cause chain"""
+        for e in cls._iter_causes(error):
+            if getattr(e, 'status_code', None) == 429:
+                return True
+            response = getattr(e, 'response', None)
+            if getattr(response, 'status_code', None) == 429:
+                return True
+            if 'ratelimit' in type(e).__name__.lower():
+                return True
+        return False
+
+    @staticmethod
+    def _headers(error: BaseException):
+        response = getattr(error, 'response', None)
+        return getattr(response, 'headers', None) or {}
+
+    @classmethod
+    def parse_retry_after(cls, error: BaseException) -> Optional[float]:
+        """Extract a Retry-After hint (seconds) from headers or the error body"""
+        for e in cls._iter_causes(error):
+            headers = cls._headers(e)
+            if headers.get('retry-after-ms'):
+                try:
+                    return float(headers['retry-after-ms']) / 1000.0
+                except ValueError:
+                    pass
+            value = headers.get('retry-after')
+            if value:
+                try:
+                    return float(value)
+                except ValueError:
+                    try:
+                        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                    except (TypeError, ValueError):
+                        pass
+
+            text = str(e)
+            for pattern in cls.RETRY_AFTER_PATTERNS:
+                match = pattern.search(text)
+                if match:
+                    return float(match.group(1))
+        return None
+
+    @classmethod
+    def _parse_limit_headers(cls, error: BaseException):
+        for e in cls._iter_causes(error):
+            headers = cls._headers(e)
+            requests = headers.get('x-ratelimit-limit-requests')
+            tokens = headers.get('x-ratelimit-limit-tokens')
+            if requests or tokens:
+                try:
+                    return (int(requests) if requests else None, int(tokens) if tokens else None)
+                except ValueError:
+                    break
+        return None, None
@@ -0,0 +1,249 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+# Innermost open span of the current thread / context; children link to it
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed operation; `attrs` are free-form details shown in the trace viewer"""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'category', 'start', 'duration',
+                 'thread', 'attrs', 'error')
+
+    def __init__(self, trace_id: str, span_id: int, parent_id: Optional[int], name: str,
+                 category: str, start: float, attrs: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.start = start
+        self.duration = 0.0
+        self.thread = threading.current_thread().name
+        self.attrs = attrs
+        self.error = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'category': self.category,
+            'start': round(self.start, 6),
+            'duration': round(self.duration, 6),
+            'thread': self.thread,
+            'attrs': self.attrs,
+            'error': self.error
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded when tracing is off, so callers can always call `set`"""
+
+    def set(self, **attrs):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    In-process span recorder.
+
+    A span opened with no parent starts a new trace (one per workflow run);
+    nested spans, including those opened by tools and LLM calls, join the
+    trace of the innermost open span. Finished spans are kept in memory until
+    a run exports or discards its trace, up to `max_spans` in total.
+    """
+
+    def __init__(self, max_spans: int = 200000):
+        self.max_spans = max_spans
+        self.dropped = 0
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # Wall-clock anchor for the monotonic timer, so exported timestamps are absolute
+        self._wall_epoch = time.time()
+        self._perf_epoch = time.perf_counter()
+
+    def _now(self) -> float:
+        return self._wall_epoch + (time.perf_counter() - self._perf_epoch)
+
+    @contextmanager
+    def span(self, name: str, category: str = "", **attrs):
+        parent = _current_span.get()
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        span = Span(
+            parent.trace_id if parent is not None else uuid.uuid4().hex[:16],
+            span_id,
+            parent.span_id if parent is not None else None,
+            name,
+            category,
+            self._now(),
+            attrs
+        )
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            if len(self._spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            return [span for span in self._spans if trace_id is None or span.trace_id == trace_id]
+
+    def discard(self, trace_id: str):
+        """Forget a trace once it has been exported"""
+        with self._lock:
+            self._spans = [span for span in self._spans if span.trace_id != trace_id]
+
+    def summary(self, trace_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Seconds spent per category, e.g. model latency vs tool I/O vs waiting.
+
+        Categories are charged self time (a span's duration minus its children's),
+        so a wait nested in an LLM call counts as waiting only, and a stage is
+        not charged again for the kickoffs inside it. `inclusive_seconds` keeps
+        the full durations.
+        """
+        spans = self.spans(trace_id)
+        child_seconds: Dict[int, float] = {}
+        for span in spans:
+            if span.parent_id is not None:
+                child_seconds[span.parent_id] = child_seconds.get(span.parent_id, 0.0) + span.duration
+
+        categories: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            totals = categories.setdefault(span.category or 'other',
+                                           {'count': 0, 'seconds': 0.0, 'inclusive_seconds': 0.0, 'errors': 0})
+            totals['count'] += 1
+            # Children running in parallel threads can outlast their parent; clamp at zero
+            totals['seconds'] += max(0.0, span.duration - child_seconds.get(span.span_id, 0.0))
+            totals['inclusive_seconds'] += span.duration
+            totals['errors'] += span.error is not None
+        for totals in categories.values():
+            totals['seconds'] = round(totals['seconds'], 3)
+            totals['inclusive_seconds'] = round(totals['inclusive_seconds'], 3)
+
+        roots = [span for span in spans if span.parent_id is None]
+        slowest = sorted((span for span in spans if span.parent_id is not None),
+                         key=lambda span: span.duration, reverse=True)[:10]
+        return {
+            'spans': len(spans),
+            'wall_seconds': round(sum(span.duration for span in roots), 3),
+            'categories': categories,
+            'slowest': [
+                {'name': span.name, 'category': span.category, 'seconds': round(span.duration, 3)}
+                for span in slowest
+            ]
+        }
+
+    def export(self, path: str, trace_id: Optional[str] = None, fmt: str = "chrome") -> str:
+        """
+        Write spans as JSON lines ("jsonl") or as a Chrome trace ("chrome"),
+        which chrome://tracing and Perfetto open directly.
+        """
+        spans = self.spans(trace_id)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if fmt == "jsonl":
+                for span in spans:
+                    f.write(json.dumps(span.to_dict(), default=str) + '\n')
+            else:
+                json.dump(self._chrome_trace(spans), f, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def _chrome_trace(spans: List[Span]) -> Dict[str, Any]:
+        pid = os.getpid()
+        thread_ids: Dict[str, int] = {}
+        events = []
+        for span in spans:
+            tid = thread_ids.setdefault(span.thread, len(thread_ids) + 1)
+            args = dict(span.attrs)
+            if span.error is not None:
+                args['error'] = span.error
+            events.append({
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': int(span.start * 1_000_000),
+                'dur': int(span.duration * 1_000_000),
+                'pid': pid,
+                'tid': tid,
+                'args': args
+            })
+        # Metadata events so the viewer labels rows with thread names
+        for thread, tid in thread_ids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def prune_traces(directory: str, keep: int):
+    """Delete all but the `keep` most recent trace files in `directory`"""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(('.json', '.jsonl'))]
+    except OSError:
+        return
+    paths = sorted((os.path.join(directory, name) for name in names), key=os.path.getmtime, reverse=True)
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """Install the process-wide tracer; None turns tracing off"""
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, category: str = "", **attrs):
+    """Context manager timing one operation on the installed tracer (a no-op without one)"""
+    if _tracer is None:
+        return nullcontext(NULL_SPAN)
+    return _tracer.span(name, category, **attrs)
+
+
+def current_span():
+    return _current_span.get()
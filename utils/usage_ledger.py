@@ -0,0 +1,226 @@
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+USAGE_FIELDS = ('prompt_tokens', 'completion_tokens', 'cached_prompt_tokens', 'total_tokens',
+                'successful_requests', 'failed_requests')
+
+# Usage objects of the LLM responses received inside the innermost `capture_usage()`
+_captured: contextvars.ContextVar = contextvars.ContextVar('captured_usage', default=None)
+# Ledger and tags (agent role, task class, brief) that responses are recorded under
+_scope: contextvars.ContextVar = contextvars.ContextVar('usage_scope', default=None)
+_hook_lock = threading.Lock()
+_hook_installed = False
+
+
+def usage_from_response(usage: Any) -> Dict[str, int]:
+    """Token counts from one litellm response `usage` (object or dict)"""
+    if usage is None:
+        return {'prompt_tokens': 0, 'completion_tokens': 0, 'cached_prompt_tokens': 0, 'total_tokens': 0}
+
+    def field(source: Any, name: str) -> Any:
+        return source.get(name) if isinstance(source, dict) else getattr(source, name, None)
+
+    prompt_tokens = int(field(usage, 'prompt_tokens') or 0)
+    completion_tokens = int(field(usage, 'completion_tokens') or 0)
+    details = field(usage, 'prompt_tokens_details')
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'cached_prompt_tokens': int((field(details, 'cached_tokens') if details is not None else 0) or 0),
+        'total_tokens': int(field(usage, 'total_tokens') or prompt_tokens + completion_tokens)
+    }
+
+
+def brief_id(brief: str) -> str:
+    """Stable short id so ledger entries of the same brief aggregate across runs"""
+    return hashlib.sha256(brief.strip().encode('utf-8')).hexdigest()[:12]
+
+
+def install_usage_hook():
+    """
+    Wrap litellm.completion once so the usage of every response reaches the
+    active `capture_usage()` of the calling thread. crewai only returns the
+    response text, so this is the one place the per-response usage is visible.
+    """
+    global _hook_installed
+    with _hook_lock:
+        if _hook_installed:
+            return
+        _hook_installed = True
+        try:
+            import litellm
+        except ImportError:
+            return
+
+        completion = litellm.completion
+
+        @functools.wraps(completion)
+        def metered_completion(*args, **kwargs):
+            response = completion(*args, **kwargs)
+            captured = _captured.get()
+            usage = getattr(response, 'usage', None)
+            if captured is not None and usage is not None:
+                captured.append(usage)
+            return response
+
+        litellm.completion = metered_completion
+
+
+@contextmanager
+def capture_usage():
+    """Collect the usage of the LLM responses received in this block"""
+    captured: List[Any] = []
+    token = _captured.set(captured)
+    try:
+        yield captured
+    finally:
+        _captured.reset(token)
+
+
+class UsageScope:
+    """Tags and running totals of the LLM responses recorded during one crew kickoff"""
+
+    def __init__(self, ledger: "UsageLedger", agent_role: str, task_class: str, brief: str):
+        self.ledger = ledger
+        self.agent_role = agent_role
+        self.task_class = task_class
+        self.brief = brief
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.entries.append(entry)
+
+    def totals(self) -> Dict[str, Any]:
+        with self._lock:
+            return UsageLedger.summarize(self.entries)['total']
+
+
+@contextmanager
+def usage_scope(ledger: "UsageLedger", agent_role: str = "", task_class: str = "", brief: str = ""):
+    """Record every LLM response made in this block to `ledger` under the given tags"""
+    scope = UsageScope(ledger, agent_role, task_class, brief)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def record_responses(model: str, usages: List[Any], error: Optional[BaseException] = None):
+    """
+    Record captured responses in the active usage scope (a no-op outside one).
+    A request that failed without a response is recorded as a failed request,
+    since it still counts against the provider's request quota.
+    """
+    scope = _scope.get()
+    if scope is None:
+        return
+    for usage in usages:
+        scope.add(scope.ledger.record(model, usage_from_response(usage), scope.agent_role,
+                                      scope.task_class, scope.brief))
+    if error is not None and not usages:
+        scope.add(scope.ledger.record(model, None, scope.agent_role, scope.task_class, scope.brief,
+                                      error=error))
+
+
+class UsageLedger:
+    """
+    Append-only JSONL ledger of LLM token usage and estimated cost.
+
+    One entry is recorded per LLM response, tagged with the agent role, the
+    task class and the brief, so usage can be totalled along any of them with
+    `summarize`. `pricing` maps a model to USD per million prompt and
+    completion tokens; models without a price are costed at 0. Without a
+    `ledger_path` entries are only returned, never persisted. Once the ledger
+    grows past `max_bytes` it is rotated to `<ledger_path>.1`, replacing the
+    previous rotation, so totals read back cover the recent ledger only.
+    """
+
+    def __init__(self, ledger_path: Optional[str], pricing: Dict[str, Dict[str, float]],
+                 max_bytes: int = 20 * 1024 * 1024):
+        self.ledger_path = ledger_path
+        self.pricing = pricing
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def estimate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        price = self.pricing.get(model, {})
+        cost = (prompt_tokens * price.get('prompt', 0.0) + completion_tokens * price.get('completion', 0.0)) / 1_000_000
+        return round(cost, 6)
+
+    def record(self, model: str, tokens: Optional[Dict[str, int]], agent_role: str = "", task_class: str = "",
+               brief: str = "", error: Optional[BaseException] = None) -> Dict[str, Any]:
+        """Append one entry for a single LLM response (or failed request) and return it"""
+        tokens = tokens or usage_from_response(None)
+        entry = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'model': model,
+            'agent_role': agent_role,
+            'task_class': task_class,
+            'brief_id': brief_id(brief),
+            'brief': brief[:200],
+            **tokens,
+            'successful_requests': 0 if error is not None else 1,
+            'failed_requests': 1 if error is not None else 0,
+            'cost_usd': self.estimate_cost(model, tokens['prompt_tokens'], tokens['completion_tokens'])
+        }
+        if error is not None:
+            entry['error'] = type(error).__name__
+        if not self.ledger_path:
+            return entry
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.ledger_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                if os.path.exists(self.ledger_path) and os.path.getsize(self.ledger_path) >= self.max_bytes:
+                    os.replace(self.ledger_path, f"{self.ledger_path}.1")
+                with open(self.ledger_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f"⚠️ Failed to append to usage ledger: {str(e)}")
+        return entry
+
+    def entries(self, brief: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every persisted entry, optionally only those of one brief"""
+        wanted = brief_id(brief) if brief is not None else None
+        entries = []
+        if not self.ledger_path:
+            return entries
+        try:
+            with open(self.ledger_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn line from an interrupted append
+                    if wanted is None or entry.get('brief_id') == wanted:
+                        entries.append(entry)
+        except OSError:
+            pass
+        return entries
+
+    @staticmethod
+    def summarize(entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Totals overall and per agent role, task class and brief"""
+        def add(totals: Dict[str, Any], entry: Dict[str, Any]):
+            for field in USAGE_FIELDS:
+                totals[field] = totals.get(field, 0) + entry.get(field, 0)
+            totals['cost_usd'] = round(totals.get('cost_usd', 0.0) + entry.get('cost_usd', 0.0), 6)
+
+        summary = {'total': {}, 'by_agent': {}, 'by_task': {}, 'by_brief': {}}
+        for entry in entries:
+            add(summary['total'], entry)
+            add(summary['by_agent'].setdefault(entry.get('agent_role') or 'unknown', {}), entry)
+            add(summary['by_task'].setdefault(entry.get('task_class') or 'unknown', {}), entry)
+            add(summary['by_brief'].setdefault(entry.get('brief_id', ''), {}), entry)
+        return summary
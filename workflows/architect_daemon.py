@@ -0,0 +1,243 @@
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from tools.output_manifest import OutputManifest
+
+
+class Job:
+    """A brief submitted to the daemon and its lifecycle"""
+
+    def __init__(self, brief: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.brief = brief
+        self.status = 'queued'
+        self.output_dir = ''
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.progress: Optional[Callable[[], Optional[Dict[str, Any]]]] = None
+
+    def completeness(self) -> Optional[Dict[str, Any]]:
+        """Live completeness while running, the final snapshot once finished"""
+        if self.result is not None:
+            return self.result.get('completeness')
+        progress = self.progress
+        return progress() if progress is not None else None
+
+    def to_status(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'output_dir': self.output_dir,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+            'completeness': self.completeness()
+        }
+
+
+class ArchitectDaemon:
+    """
+    Long-running job runner that keeps workflows and agents warm between briefs.
+
+    Each worker thread builds its workflow once and re-targets it at a fresh
+    per-job output directory. Briefs wait in a bounded queue; when the queue
+    is full, submission is rejected instead of piling up work.
+    """
+
+    def __init__(self, workflow_factory: Callable[[str], Any], output_root: str,
+                 workers: int = 1, max_queue: int = 20, max_history: int = 500):
+        self.workflow_factory = workflow_factory
+        self.output_root = output_root
+        self.workers = max(1, workers)
+        self.max_history = max_history
+        self._queue: "queue.Queue[Job]" = queue.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._live_workers = 0
+        self._setup_error: Optional[str] = None
+
+    def start(self):
+        os.makedirs(self.output_root, exist_ok=True)
+        self._live_workers = self.workers
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"architect-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, brief: str) -> Job:
+        """
+        Queue a brief; raises queue.Full when the job queue is at capacity and
+        RuntimeError when no worker could be started
+        """
+        job = Job(brief)
+        job.output_dir = os.path.join(self.output_root, job.id)
+        with self._lock:
+            if self._threads and self._live_workers == 0:
+                raise RuntimeError(f"No architect workers are running: {self._setup_error}")
+            self._queue.put_nowait(job)
+            self._jobs[job.id] = job
+            self._trim_history()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """(status, result) of a job read under the lock the workers update it with"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return job.to_status(), job.result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {'queue_depth': self._queue.qsize(), 'workers': self.workers, 'jobs': counts}
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ('completed', 'failed')]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def _update(self, job: Job, **fields):
+        with self._lock:
+            for name, value in fields.items():
+                setattr(job, name, value)
+
+    def _worker(self):
+        try:
+            workflow = self.workflow_factory(self.output_root)
+        except Exception as e:
+            self._retire_worker(f"{type(e).__name__}: {e}")
+            return
+
+        while True:
+            job = self._queue.get()
+            self._update(job, status='running', started_at=time.time())
+            try:
+                OutputManifest.discard(job.output_dir)
+                if os.path.exists(job.output_dir):
+                    shutil.rmtree(job.output_dir)
+                os.makedirs(job.output_dir)
+                workflow.set_output_dir(job.output_dir)
+                self._update(job, progress=getattr(workflow, 'completeness_snapshot', None))
+                result = workflow.execute(job.brief)
+                self._update(job, result=result, error=result.get('error'),
+                             status='completed' if result.get('status') == 'completed' else 'failed')
+            except Exception as e:
+                self._update(job, status='failed', error=str(e))
+            finally:
+                self._update(job, progress=None, finished_at=time.time())
+                self._queue.task_done()
+            print(f"📦 Job {job.id} finished: {job.status}")
+
+    def _retire_worker(self, error: str):
+        """A worker whose workflow could not be built; the last one to go fails every queued job"""
+        print(f"❌ Architect worker failed to start: {error}")
+        with self._lock:
+            self._live_workers -= 1
+            self._setup_error = error
+            if self._live_workers > 0:
+                return
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                job.status = 'failed'
+                job.error = f"No architect workers are running: {error}"
+                job.finished_at = time.time()
+                self._queue.task_done()
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Local JSON API: POST /jobs, GET /jobs/<id>, GET /jobs/<id>/result, GET /health"""
+
+    daemon: ArchitectDaemon = None
+    JOB_PATH = re.compile(r'^/jobs/([0-9a-f]+)(/result)?/?$')
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {'error': 'Request body must be JSON'})
+            return
+
+        brief = payload.get('brief') if isinstance(payload, dict) else None
+        if not brief or not str(brief).strip():
+            self._send_json(400, {'error': "Field 'brief' is required"})
+            return
+        try:
+            job = self.daemon.submit(str(brief))
+        except queue.Full:
+            self._send_json(503, {'error': 'Job queue is full, retry later'})
+            return
+        except RuntimeError as e:
+            self._send_json(503, {'error': str(e)})
+            return
+        self._send_json(202, job.to_status())
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, {'status': 'ok', **self.daemon.stats()})
+            return
+
+        match = self.JOB_PATH.match(self.path)
+        snapshot = self.daemon.snapshot(match.group(1)) if match else None
+        if snapshot is None:
+            self._send_json(404, {'error': 'Job not found'})
+            return
+        status, result = snapshot
+        if not match.group(2):
+            self._send_json(200, status)
+        elif status['status'] in ('queued', 'running'):
+            self._send_json(409, {'error': f"Job is {status['status']}", **status})
+        else:
+            self._send_json(200, {**status, 'result': result})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(daemon: ArchitectDaemon, host: str, port: int):
+    """Start the daemon workers and serve the job API until interrupted"""
+    daemon.start()
+    handler = type('JobRequestHandler', (_JobRequestHandler,), {'daemon': daemon})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"🛰️ Architect daemon listening on http://{host}:{port} ({daemon.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down architect daemon")
+    finally:
+        server.server_close()
@@ -1,5 +1,5 @@
 from crewai import Crew, Process
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import re
 import os
 import time
@@ -7,73 +7,198 @@ import json
 from config import Config
 from agents.review_agent import ReviewAgent
 from tasks.review_task import ReviewTask
+from workflows.stage_scheduler import Stage, StageScheduler
+from workflows.checkpoint import CheckpointStore
+from tools.output_manifest import OutputManifest
+from tools.output_backend import DiskOutputBackend
+from tools.batch_lint import BatchLinter
+from utils.code_index import CodeIndex
+from utils.context_packer import ContextPacker
+from utils.tracing import prune_traces, span
+from utils.usage_ledger import UsageLedger, usage_scope
+from utils.api_contract import check_contract as check_api_contract, format_report as format_contract_report
 
 class ArchitectWorkflow:
-    def __init__(self, agents: Dict[str, Any], tools: Dict[str, Any]):
+    # Stages whose agents write project files
+    GENERATION_STAGES = ('backend', 'frontend', 'integration', 'final_review')
+    
+    def __init__(self, agents: Dict[str, Any], tools: Dict[str, Any], output_dir: str = Config.OUTPUT_DIR,
+                 backend: Any = None):
         self.agents = agents
         self.tools = tools
+        self.output_dir = output_dir
         self.generated_files = []
+        # Share the file writers' backend so reads and the final flush see their writes
+        if backend is None:
+            backend = getattr(tools.get('file_writer'), 'backend', None) or DiskOutputBackend()
+        self.backend = backend
+        self.completeness = None
+        self.code_index = None
+        self.packing_reports = []
+        self.usage_records = []
+        self.deferred_checkpoints = []
+        self.project_brief = ""
+        self.ledger = Config.get_usage_ledger()
+        self.linter = BatchLinter(Config.LINT_WORKERS, Config.get_lint_cache())
+        self.tracer = Config.get_tracer() if Config.TRACING_ENABLED else None
+    
+    def set_output_dir(self, output_dir: str):
+        """Point the workflow and its file writer at a new output root (reused warm workflows)"""
+        self.output_dir = output_dir
+        for tool in self.tools.values():
+            if hasattr(tool, 'output_dir'):
+                tool.output_dir = output_dir
     
-    def execute(self, project_brief: str) -> Dict[str, Any]:
+    def execute(self, project_brief: str, checkpoints: Optional[CheckpointStore] = None) -> Dict[str, Any]:
         """
-        Execute the complete AI Software Architect workflow with rate limit protection
+        Execute the complete AI Software Architect workflow with rate limit protection.
+        When a CheckpointStore is given, stages whose inputs are unchanged are skipped.
         """
         print("🚀 Starting AI Software Architect Workflow...")
         print(f"📋 Project Brief: {project_brief}")
         
+        with span("workflow", "workflow", brief=project_brief[:200], output_dir=self.output_dir) as root:
+            result = self._execute(project_brief, checkpoints)
+        if self.tracer is not None:
+            result['trace'] = self._export_trace(root.trace_id)
+        return result
+    
+    def _execute(self, project_brief: str, checkpoints: Optional[CheckpointStore]) -> Dict[str, Any]:
         try:
-            # Step 1: Specification Generation
-            print("\n📝 Step 1: Generating Technical Specifications...")
-            specifications = self._generate_specifications(project_brief)
-            Config.apply_delay("coordinator")
-            
-            backend_spec = specifications['backend_spec']
-            frontend_spec = specifications['frontend_spec']
-            
-            # Step 2: Backend Development
-            print("\n⚙️ Step 2: Generating Backend Code...")
-            backend_result = self._generate_backend(backend_spec) 
-            Config.apply_delay("backend")
-            
-            # Step 3: Frontend Development
-            print("\n🎨 Step 3: Generating Frontend Code...")
-            frontend_result = self._generate_frontend(frontend_spec, backend_spec)
-            Config.apply_delay("frontend")
-            
-            # Step 4: Integration Review
-            print("\n🔍 Step 4: Integration Review...")
-            integration_report = self._perform_integration_review(
-                backend_result['raw_output'],
-                frontend_result['raw_output']
-            )
-            Config.apply_delay("integration")
-            
-            # Step 5: Final Review & Correction
-            print("\n🔧 Step 5: Final Review & Correction...")
-            final_review = self._perform_final_review(project_brief, specifications)
-            Config.apply_delay("review")
+            self.packing_reports = []
+            self.usage_records = []
+            self.deferred_checkpoints = []
+            self.project_brief = project_brief
+            self._attach_completeness()
+            self._attach_code_index()
+            stages = self._build_stages(project_brief)
+            if checkpoints is not None:
+                for stage in stages:
+                    stage.fn = self._with_checkpoint(checkpoints, stage.name, stage.fn, project_brief)
+            results = self._build_scheduler().run(stages)
             
             # Step 6: Finalization
             print("\n✅ Step 6: Finalizing Project...")
-            return self._finalize_project(project_brief, specifications, integration_report, final_review)
+            with span("stage:finalize", "stage"):
+                return self._finalize_project(
+                    project_brief,
+                    results['specifications'],
+                    results['integration'],
+                    results['final_review']
+                )
             
         except Exception as e:
             print(f"💥 Workflow execution failed: {str(e)}")
+            generated_files = self._scan_generated_files()
             return {
                 'project_brief': project_brief,
                 'status': 'failed',
                 'error': str(e),
-                'generated_files': self._scan_generated_files(),
+                'generated_files': generated_files,
+                'output_backend': self._flush_output(),
+                'usage': self.usage_summary(),
                 'summary': f"Workflow failed: {str(e)}"
             }
     
+    def _build_stages(self, project_brief: str) -> List[Stage]:
+        """
+        Express the workflow as a dependency graph. Backend and frontend generation
+        only need the specifications, so they run side by side. Integration review
+        starts once both exist, and the final review runs after it: both agents can
+        write files, and the review must see the integration fixes.
+        """
+        model = Config.MODEL_NAME
+        return [
+            Stage(
+                'specifications',
+                lambda r: self._generate_specifications(project_brief),
+                resource=model,
+                label="📝 Step 1: Generating Technical Specifications..."
+            ),
+            Stage(
+                'backend',
+                lambda r: self._generate_backend(r['specifications']['backend_spec']),
+                depends_on=['specifications'],
+                resource=model,
+                label="⚙️ Step 2: Generating Backend Code..."
+            ),
+            Stage(
+                'frontend',
+                lambda r: self._generate_frontend(
+                    r['specifications']['frontend_spec'],
+                    r['specifications']['backend_spec']
+                ),
+                depends_on=['specifications'],
+                resource=model,
+                label="🎨 Step 3: Generating Frontend Code..."
+            ),
+            Stage(
+                'integration',
+                lambda r: self._perform_integration_review(
+                    r['backend']['raw_output'],
+                    r['frontend']['raw_output']
+                ),
+                depends_on=['backend', 'frontend'],
+                resource=model,
+                label="🔍 Step 4: Integration Review..."
+            ),
+            Stage(
+                'final_review',
+                lambda r: self._perform_final_review(project_brief, r['specifications']),
+                depends_on=['specifications', 'backend', 'frontend', 'integration'],
+                resource=model,
+                label="🔧 Step 5: Final Review & Correction..."
+            ),
+        ]
+    
+    def _with_checkpoint(self, checkpoints: CheckpointStore, name: str, fn, project_brief: str):
+        """Wrap a stage so it reuses a checkpointed result produced from identical inputs"""
+        def run(inputs: Dict[str, Any]) -> Any:
+            fingerprint = checkpoints.fingerprint(name, {'brief': project_brief, 'inputs': inputs})
+            cached = checkpoints.load(name, fingerprint)
+            if cached is not None:
+                print(f"⏭️ Skipping {name}: checkpoint found with unchanged inputs")
+                return cached
+            
+            result = fn(inputs)
+            # Failed or fallback results are not checkpointed so a resume retries them
+            if isinstance(result, dict) and result.get('success', True) and not result.get('is_fallback'):
+                if self.backend.in_memory:
+                    # The stage's files only exist in memory; a checkpoint saved now would let
+                    # a resume after a crash skip generation and finalize an empty project
+                    self.deferred_checkpoints.append((checkpoints, name, fingerprint, result))
+                else:
+                    checkpoints.save(name, fingerprint, result)
+            return result
+        return run
+    
+    def _save_deferred_checkpoints(self, output_stats: Dict[str, Any]):
+        """Save in-memory runs' checkpoints once their files have been flushed"""
+        deferred, self.deferred_checkpoints = self.deferred_checkpoints, []
+        for checkpoints, name, fingerprint, result in deferred:
+            # A resume reads the output directory, which a tarball flush never fills
+            if output_stats.get('output_dir') or name not in self.GENERATION_STAGES:
+                checkpoints.save(name, fingerprint, result)
+    
+    def _build_scheduler(self) -> StageScheduler:
+        """Stage scheduler whose per-model concurrency follows the rate limiter"""
+        limiter = Config.get_rate_limiter()
+        model = Config.MODEL_NAME
+        return StageScheduler(
+            max_workers=Config.MAX_CONCURRENT_STAGES,
+            resource_limits={
+                model: lambda: limiter.concurrency_limit(model, Config.MAX_CONCURRENT_STAGES)
+            }
+        )
+    
     def _generate_specifications(self, project_brief: str) -> Dict[str, Any]:
         """Generate backend and frontend specifications with error handling"""
         try:
             from tasks.specification_task import SpecificationTask
             
-            spec_task = SpecificationTask(self.agents['coordinator'].get_agent())
+            spec_task = SpecificationTask(self.agents['coordinator'].get_agent(), packer=self._packer('specification'))
             task = spec_task.create_task(project_brief)
+            self._record_packing(spec_task)
             
             crew = Crew(
                 agents=[self.agents['coordinator'].get_agent()],
@@ -82,7 +207,7 @@ class ArchitectWorkflow:
                 verbose=True
             )
             
-            result = crew.kickoff()
+            result = self._kickoff(crew, type(spec_task).__name__)
             return self._parse_specifications(str(result))
             
         except Exception as e:
@@ -90,6 +215,39 @@ class ArchitectWorkflow:
             # Return fallback specifications to allow workflow to continue
             return self._create_fallback_specifications(project_brief)
     
+    def _kickoff(self, crew: Crew, task_class: str = ""):
+        """
+        Run crew.kickoff() and meter its token usage. Rate limiting happens per
+        LLM request in the shared client, so a 429 retries that request only.
+        """
+        agents = [getattr(agent, 'role', '') for agent in crew.agents]
+        agent_role = ', '.join(agent for agent in agents if agent)
+        
+        # Every LLM response inside the kickoff is metered under this scope, including
+        # those of a kickoff that fails; crew.token_usage accumulates across kickoffs
+        with usage_scope(self.ledger, agent_role, task_class, self.project_brief) as usage:
+            try:
+                with span("crew.kickoff", "crew", agents=agents):
+                    return crew.kickoff()
+            finally:
+                self._record_usage(usage.entries, task_class or agent_role)
+    
+    def _record_usage(self, entries: List[Dict[str, Any]], label: str):
+        """Add one kickoff's per-response ledger entries to this run's usage"""
+        self.usage_records.extend(entries)
+        totals = UsageLedger.summarize(entries)['total']
+        if totals:
+            print(f"🪙 {label}: {totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens "
+                  f"over {totals['successful_requests']} responses (~${totals['cost_usd']:.4f})")
+    
+    def usage_summary(self) -> Dict[str, Any]:
+        """This run's token usage and cost per agent role and task class, plus the brief's total to date"""
+        summary = UsageLedger.summarize(self.usage_records)
+        del summary['by_brief']  # A run has a single brief
+        summary['brief_to_date'] = UsageLedger.summarize(self.ledger.entries(self.project_brief))['total']
+        summary['ledger'] = self.ledger.ledger_path
+        return summary
+    
     def _create_fallback_specifications(self, project_brief: str) -> Dict[str, Any]:
         """Create basic specifications when AI generation fails"""
         print("🔄 Using fallback specifications...")
@@ -134,8 +292,10 @@ class ArchitectWorkflow:
         try:
             from tasks.backend_task import BackendTask
             
-            backend_task = BackendTask(self.agents['backend'].get_agent(), backend_spec)
+            backend_task = BackendTask(self.agents['backend'].get_agent(), backend_spec,
+                                       packer=self._packer('backend'))
             task = backend_task.create_task()
+            self._record_packing(backend_task)
             
             crew = Crew(
                 agents=[self.agents['backend'].get_agent()],
@@ -144,7 +304,7 @@ class ArchitectWorkflow:
                 verbose=True
             )
             
-            result = crew.kickoff()
+            result = self._kickoff(crew, type(backend_task).__name__)
             return {'raw_output': str(result), 'spec': backend_spec, 'success': True}
             
         except Exception as e:
@@ -164,9 +324,11 @@ class ArchitectWorkflow:
             frontend_task = FrontendTask(
                 self.agents['frontend'].get_agent(), 
                 frontend_spec, 
-                api_structure
+                api_structure,
+                packer=self._packer('frontend')
             )
             task = frontend_task.create_task()
+            self._record_packing(frontend_task)
             
             crew = Crew(
                 agents=[self.agents['frontend'].get_agent()],
@@ -175,7 +337,7 @@ class ArchitectWorkflow:
                 verbose=True
             )
             
-            result = crew.kickoff()
+            result = self._kickoff(crew, type(frontend_task).__name__)
             return {'raw_output': str(result), 'spec': frontend_spec, 'success': True}
             
         except Exception as e:
@@ -192,12 +354,40 @@ class ArchitectWorkflow:
         try:
             from tasks.integration_task import IntegrationTask
             
+            # Deterministic static check first; the LLM review only runs when it finds mismatches
+            contract = self._check_api_contract()
+            # Routes in backend files that failed to parse were never checked
+            verified = (contract is not None and contract['routes'] > 0 and contract['calls'] > 0
+                        and not contract['backend_errors'])
+            if verified and not contract['mismatches']:
+                print("✅ Static API contract check found no mismatches; skipping LLM integration review")
+                return {
+                    'report': format_contract_report(contract),
+                    'issues_found': False,
+                    'contract': contract,
+                    'llm_skipped': True,
+                    'success': True
+                }
+            
+            # With known mismatches, send only the code around them instead of the full summaries
+            code_context = ""
+            if verified and self.code_index is not None:
+                code_context = self.code_index.snippets(
+                    [path for mismatch in contract['mismatches'] for path in mismatch['files']],
+                    [symbol for mismatch in contract['mismatches'] for symbol in mismatch['symbols']],
+                    max_chars=Config.INTEGRATION_CONTEXT_CHARS
+                )
+            
             integration_task = IntegrationTask(
                 self.agents['coordinator'].get_agent(),
                 backend_code_summary,
-                frontend_code_summary
+                frontend_code_summary,
+                contract_report=format_contract_report(contract) if contract is not None else "",
+                code_context=code_context,
+                packer=self._packer('integration')
             )
             task = integration_task.create_task()
+            self._record_packing(integration_task)
             
             crew = Crew(
                 agents=[self.agents['coordinator'].get_agent()],
@@ -206,14 +396,19 @@ class ArchitectWorkflow:
                 verbose=True
             )
             
-            result = crew.kickoff()
+            result = self._kickoff(crew, type(integration_task).__name__)
             
-            issues_found = any(keyword in str(result).lower() for keyword in 
-                              ['mismatch', 'error', 'issue', 'inconsistent', 'correction needed', 'fix', 'problem'])
+            if contract is not None and contract['mismatches']:
+                issues_found = True  # The static check already found real mismatches
+            else:
+                issues_found = any(keyword in str(result).lower() for keyword in 
+                                  ['mismatch', 'error', 'issue', 'inconsistent', 'correction needed', 'fix', 'problem'])
             
             return {
                 'report': str(result),
                 'issues_found': issues_found,
+                'contract': contract,
+                'llm_skipped': False,
                 'success': True
             }
             
@@ -226,18 +421,49 @@ class ArchitectWorkflow:
                 'error': str(e)
             }
     
+    def _check_api_contract(self) -> Optional[Dict[str, Any]]:
+        """Diff frontend API calls and TS interfaces against backend routes and models"""
+        if not Config.API_CONTRACT_CHECK_ENABLED:
+            return None
+        try:
+            self._flush_writes()
+            with span("api_contract_check", "analysis"):
+                contract = check_api_contract(
+                    self._manifest().list_files(),
+                    lambda relative_path: self.backend.read(os.path.join(self.output_dir, relative_path))
+                )
+        except Exception as e:
+            print(f"⚠️ Static API contract check failed: {str(e)}")
+            return None
+        print(f"🔗 API contract: {contract['routes']} routes, {contract['calls']} frontend calls, "
+              f"{len(contract['mismatches'])} mismatches")
+        return contract
+    
     def _perform_final_review(self, project_brief: str, specifications: dict) -> Dict[str, Any]:
        """Perform intelligent completion review"""
        try:
          print("🔧 Performing intelligent project completion...")
         
-        # Scan current state before review
-         files_before = self._scan_generated_files()
+        # Make pending writes visible before ReviewTask scans the tree
+         self._flush_writes()
+        
+        # Remember the manifest position so new files can be diffed cheaply
+         manifest = self._manifest()
+         seq_before = manifest.seq
         
         # Initialize intelligent review agent
-         review_agent = ReviewAgent(tools=[self.tools['file_writer']])
-         review_task = ReviewTask(review_agent.get_agent(), project_brief, specifications)
+         review_writer = self.tools.get('review_file_writer', self.tools['file_writer'])
+         review_agent = ReviewAgent(tools=[review_writer])
+         review_task = ReviewTask(review_agent.get_agent(), project_brief, specifications, self.output_dir,
+                                  backend=self.backend,
+                                  scan_workers=Config.REVIEW_SCAN_WORKERS,
+                                  scan_executor=Config.REVIEW_SCAN_EXECUTOR,
+                                  analysis_cache=Config.get_analysis_cache() if Config.ANALYSIS_CACHE_ENABLED else None,
+                                  completeness=self.completeness,
+                                  code_index=self.code_index,
+                                  packer=self._packer('review'))
          task = review_task.create_task()
+         self._record_packing(review_task)
         
          crew = Crew(
             agents=[review_agent.get_agent()],
@@ -246,14 +472,13 @@ class ArchitectWorkflow:
             verbose=True
         )
         
-         result = crew.kickoff()
+         result = self._kickoff(crew, type(review_task).__name__)
         
-        # Scan state after review
-         files_after = self._scan_generated_files()
+        # Files first written during the review
+         new_files = set(manifest.created_since(seq_before))
         
         # Intelligent completion detection
          review_text = str(result)
-         new_files = set(files_after) - set(files_before)
          completion_indicators = [
             'implemented', 'completed', 'added', 'created', 'finished',
             'functional', 'working', 'handlers', 'endpoints', 'components'
@@ -287,33 +512,127 @@ class ArchitectWorkflow:
             'error': str(e)
         }
     
-    def _scan_generated_files(self) -> List[str]:
-        """Scan and return all generated files"""
-        output_dir = "output"
-        generated_files = []
+    def _attach_completeness(self):
+        """Track the completeness score incrementally from this run's file writes"""
+        if self.completeness is not None:
+            self.completeness.detach()
+        self.completeness = ReviewTask.completeness_model(self.output_dir, self.backend)
+        self.completeness.attach(self._manifest())
+    
+    def _attach_code_index(self):
+        """Keep a symbol/import index of the generated code, updated on every file write"""
+        if self.code_index is not None:
+            self.code_index.detach()
+        self.code_index = CodeIndex(self.output_dir, self.backend)
+        self.code_index.attach(self._manifest())
+    
+    def completeness_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Current completeness score and missing patterns; cheap enough to poll during generation"""
+        return self.completeness.snapshot() if self.completeness is not None else None
+    
+    def _manifest(self) -> OutputManifest:
+        return OutputManifest.for_dir(self.output_dir, persist=not self.backend.in_memory)
+    
+    def _flush_writes(self):
+        """Barrier on deferred writes so scans see every acknowledged write"""
+        for path, error in self.backend.barrier():
+            print(f"⚠️ Deferred write failed for {path}: {error}")
+    
+    def _flush_output(self) -> Dict[str, Any]:
+        """Flush the output backend to its final location (a no-op barrier for plain disk writes)"""
+        try:
+            with span("output_flush", "io", in_memory=self.backend.in_memory):
+                stats = self.backend.finalize(self.output_dir)
+                if self.backend.in_memory and stats.get('output_dir'):
+                    self._manifest().compact()  # Persist the manifest next to the flushed files
+            self._save_deferred_checkpoints(stats)
+            return stats
+        except Exception as e:
+            print(f"⚠️ Failed to flush output: {str(e)}")
+            return {'error': str(e)}
+    
+    def _export_trace(self, trace_id: str) -> Dict[str, Any]:
+        """Write this run's spans to TRACE_DIR and return where they went plus a time breakdown"""
+        summary = self.tracer.summary(trace_id)
+        extension = 'jsonl' if Config.TRACE_FORMAT == 'jsonl' else 'json'
+        path = os.path.join(Config.TRACE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{trace_id}.{extension}")
+        try:
+            self.tracer.export(path, trace_id, Config.TRACE_FORMAT)
+            prune_traces(Config.TRACE_DIR, Config.TRACE_KEEP)
+        except OSError as e:
+            print(f"⚠️ Failed to export trace: {str(e)}")
+            path = None
+        finally:
+            self.tracer.discard(trace_id)
         
-        if os.path.exists(output_dir):
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, output_dir)
-                    generated_files.append(relative_path.replace('\\', '/'))  # Normalize paths
+        breakdown = ', '.join(f"{category} {totals['seconds']}s"
+                              for category, totals in sorted(summary['categories'].items()))
+        print(f"⏱️ Trace: {summary['wall_seconds']}s wall ({breakdown})" + (f" -> {path}" if path else ""))
+        return {'path': path, 'format': Config.TRACE_FORMAT, **summary}
+    
+    def _lint_project(self, generated_files: List[str]) -> Optional[Dict[str, Any]]:
+        """Lint every generated code file in one local parallel pass and write the JSON report"""
+        if not Config.LINT_ENABLED:
+            return None
+        try:
+            # Beside the output dir like the manifest, so the report never ships with the project
+            report_path = OutputManifest.sidecar_path(self.output_dir, Config.LINT_REPORT_SUFFIX)
+            with span("batch_lint", "io", files=len(generated_files)):
+                report = self.linter.lint_project(
+                    self.output_dir, generated_files, self.backend, report_path, manifest=self._manifest()
+                )
+        except Exception as e:
+            print(f"⚠️ Batch lint failed: {str(e)}")
+            return {'error': str(e)}
         
-        return generated_files
+        print(f"🧹 Linted {report['files_linted']} files ({report['relinted']} not cached): "
+              f"{len(report['invalid_syntax'])} with syntax errors, "
+              f"{report['issues']} issues, {report['warnings']} warnings")
+        return {
+            'files_linted': report['files_linted'],
+            'invalid_syntax': report['invalid_syntax'],
+            'issues': report['issues'],
+            'warnings': report['warnings'],
+            'relinted': report['relinted'],
+            'cache': report['cache'],
+            'report': report_path
+        }
+    
+    def _scan_generated_files(self) -> List[str]:
+        """Return all generated files from the output manifest (no directory walk)"""
+        self._flush_writes()
+        return self._manifest().list_files()
+    
+    def _packer(self, task_name: str) -> Optional[ContextPacker]:
+        """Token budgeter for one task's prompt, or None when packing is disabled"""
+        if not Config.CONTEXT_PACKING_ENABLED:
+            return None
+        return ContextPacker(Config.CONTEXT_BUDGETS[task_name], Config.MODEL_NAME)
+    
+    def _record_packing(self, task_builder: Any):
+        """Keep the packing report of a built task and say what was cut"""
+        report = task_builder.packing_report
+        if report is None:
+            return
+        self.packing_reports.append(report)
+        changed = [f"{section['name']} {section['action']}" for section in report['sections']
+                   if section['action'] != 'kept']
+        if changed:
+            print(f"✂️ Packed {report['task']} prompt into {report['tokens_after']}/{report['budget']} tokens "
+                  f"({', '.join(changed)})")
     
     def _finalize_project(self, project_brief: str, specifications: Dict, 
                          integration_report: Dict, final_review: Dict) -> Dict[str, Any]:
         """Finalize the project with review results"""
         
         generated_files = self._scan_generated_files()
+        lint_summary = self._lint_project(generated_files)
+        output_stats = self._flush_output()
         
-        # Count unique files (after deduplication)
-        unique_files = list(set(generated_files))
-        
-        # Analyze file structure
-        backend_files = [f for f in unique_files if f.startswith('backend/')]
-        frontend_files = [f for f in unique_files if f.startswith('frontend/')]
-        other_files = [f for f in unique_files if not f.startswith(('backend/', 'frontend/'))]
+        # Analyze file structure (manifest paths are unique, so no deduplication is needed)
+        backend_files = [f for f in generated_files if f.startswith('backend/')]
+        frontend_files = [f for f in generated_files if f.startswith('frontend/')]
+        other_files = [f for f in generated_files if not f.startswith(('backend/', 'frontend/'))]
         
         return {
             'project_brief': project_brief,
@@ -321,17 +640,24 @@ class ArchitectWorkflow:
             'specifications': specifications,
             'integration_report': integration_report,
             'final_review': final_review,
-            'generated_files': unique_files,  # Deduplicated
-            'files_count': len(unique_files),
+            'generated_files': generated_files,
+            'files_count': len(generated_files),
             'backend_files_count': len(backend_files),
             'frontend_files_count': len(frontend_files),
             'other_files_count': len(other_files),
-            'duplicates_found': len(generated_files) - len(unique_files),
             'summary': f"Successfully generated and reviewed software skeleton for: {project_brief}",
             'has_backend': len(backend_files) > 0,
             'has_frontend': len(frontend_files) > 0,
             'review_issues_fixed': final_review.get('issues_fixed', False),
             'integration_issues_found': integration_report.get('issues_found', False),
+            'skipped_writes': self._manifest().skipped_writes,
+            'output_backend': output_stats,
+            'llm_cache': Config.get_llm_cache().stats() if Config.LLM_CACHE_ENABLED else None,
+            'analysis_cache': Config.get_analysis_cache().stats() if Config.ANALYSIS_CACHE_ENABLED else None,
+            'completeness': self.completeness_snapshot(),
+            'lint': lint_summary,
+            'context_packing': self.packing_reports,
+            'usage': self.usage_summary(),
             'project_health': self._assess_project_health(
                 len(backend_files), 
                 len(frontend_files), 
@@ -415,7 +741,6 @@ class ArchitectWorkflow:
             f"   Backend Files: {result.get('backend_files_count', 0)}",
             f"   Frontend Files: {result.get('frontend_files_count', 0)}",
             f"   Other Files: {result.get('other_files_count', 0)}",
-            f"   Duplicates Fixed: {result.get('duplicates_found', 0)}",
             "",
             "🔍 QUALITY ASSESSMENT:",
             f"   Backend Created: {'✅' if result.get('has_backend') else '❌'}",
@@ -0,0 +1,140 @@
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterator, Set, Tuple
+
+from tools.output_manifest import OutputManifest
+
+
+class BatchRunner:
+    """
+    Runs many project briefs from a JSONL file on a bounded worker pool.
+
+    Each brief gets its own output root (`<output_root>/<brief-id>`) and its own
+    workflow instance; the rate limiter, LLM cache and client pool stay shared
+    across workers. One result record is appended to the results JSONL as soon
+    as each brief finishes.
+    """
+
+    def __init__(self, workflow_factory: Callable[[str], Any], output_root: str, max_workers: int = 2):
+        self.workflow_factory = workflow_factory
+        self.output_root = output_root
+        self.max_workers = max(1, max_workers)
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def iter_briefs(input_path: str) -> Iterator[Tuple[int, str, str]]:
+        """Stream (line_number, brief_id, brief) from a JSONL file, one line at a time"""
+        with open(input_path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ Skipping malformed line {line_number} in {input_path}: {e}")
+                    continue
+
+                if isinstance(record, str):
+                    record = {"brief": record}
+                elif not isinstance(record, dict):
+                    print(f"⚠️ Skipping malformed line {line_number} in {input_path}: "
+                          f"expected an object or a string, got {type(record).__name__}")
+                    continue
+                brief = record.get('brief') or record.get('project_brief')
+                if not brief:
+                    brief = '\n\n'.join(part for part in (record.get('title'), record.get('body')) if part)
+                if not brief:
+                    print(f"⚠️ Skipping line {line_number}: no brief, title or body field")
+                    continue
+
+                brief_id = str(record.get('id') or record.get('request_id') or f"brief-{line_number}")
+                yield line_number, brief_id, brief
+
+    @staticmethod
+    def _safe_dirname(brief_id: str) -> str:
+        return re.sub(r'[^A-Za-z0-9._-]+', '_', brief_id).strip('._') or 'brief'
+
+    def _output_dirname(self, brief_id: str, line_number: int, used: Set[str]) -> str:
+        """
+        Directory name for a brief, unique within this batch. Duplicate ids, or ids
+        that sanitize to the same name ("a/b" and "a_b"), get the input line number
+        appended so concurrent workers never share (and wipe) one output root.
+        """
+        dirname = self._safe_dirname(brief_id)
+        # Compare case-insensitively for case-insensitive filesystems
+        if dirname.lower() in used:
+            dirname = f"{dirname}-line{line_number}"
+        used.add(dirname.lower())
+        return dirname
+
+    def _run_one(self, brief_id: str, brief: str, dirname: str) -> Dict[str, Any]:
+        output_dir = os.path.join(self.output_root, dirname)
+        started = time.time()
+        try:
+            # A directory that cannot be reset fails this brief only, not the batch
+            OutputManifest.discard(output_dir)
+            if os.path.exists(output_dir):
+                shutil.rmtree(output_dir)
+            os.makedirs(output_dir)
+            result = self.workflow_factory(output_dir).execute(brief)
+        except Exception as e:
+            result = {'status': 'failed', 'error': str(e)}
+
+        return {
+            'id': brief_id,
+            'status': result.get('status', 'unknown'),
+            'output_dir': output_dir,
+            'files_count': result.get('files_count', len(result.get('generated_files', []))),
+            'backend_files_count': result.get('backend_files_count', 0),
+            'frontend_files_count': result.get('frontend_files_count', 0),
+            'project_health': result.get('project_health'),
+            'error': result.get('error'),
+            'elapsed_seconds': round(time.time() - started, 2)
+        }
+
+    def _write_record(self, results_file, record: Dict[str, Any]):
+        with self._write_lock:
+            results_file.write(json.dumps(record) + '\n')
+            results_file.flush()
+
+    def run(self, input_path: str, results_path: str) -> Dict[str, Any]:
+        """Process every brief in `input_path`, streaming records to `results_path`"""
+        os.makedirs(self.output_root, exist_ok=True)
+        summary = {'total': 0, 'completed': 0, 'failed': 0}
+        briefs = self.iter_briefs(input_path)
+        used_dirnames: Set[str] = set()
+
+        with open(results_path, 'w', encoding='utf-8') as results_file, \
+                ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="brief") as executor:
+            running = {}
+            exhausted = False
+            while running or not exhausted:
+                # Keep the pool full without reading the whole input up front
+                while not exhausted and len(running) < self.max_workers:
+                    try:
+                        line_number, brief_id, brief = next(briefs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    print(f"\n🎯 Queued brief {brief_id}")
+                    dirname = self._output_dirname(brief_id, line_number, used_dirnames)
+                    running[executor.submit(self._run_one, brief_id, brief, dirname)] = brief_id
+
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    brief_id = running.pop(future)
+                    record = future.result()
+                    self._write_record(results_file, record)
+                    summary['total'] += 1
+                    summary['completed' if record['status'] == 'completed' else 'failed'] += 1
+                    print(f"📦 Brief {brief_id} finished: {record['status']} ({record['elapsed_seconds']}s)")
+
+        return summary
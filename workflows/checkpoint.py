@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+
+class CheckpointStore:
+    """
+    Persists each workflow stage result under a run directory.
+
+    A checkpoint is reused only when the stage's fingerprint (a hash of the
+    brief and every upstream result it consumed) matches, so a stage is re-run
+    as soon as anything it depends on changed.
+    """
+
+    def __init__(self, run_dir: str):
+        self.run_dir = run_dir
+        os.makedirs(run_dir, exist_ok=True)
+
+    @staticmethod
+    def new_run_id() -> str:
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    @staticmethod
+    def fingerprint(stage: str, inputs: Any) -> str:
+        payload = json.dumps({"stage": stage, "inputs": inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.run_dir, f"{stage}.json")
+
+    def load(self, stage: str, fingerprint: str) -> Optional[Any]:
+        """Return the stored result for `stage` if it was produced from the same inputs"""
+        try:
+            with open(self._path(stage), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('fingerprint') != fingerprint:
+            return None
+        return checkpoint.get('result')
+
+    def save(self, stage: str, fingerprint: str, result: Any):
+        checkpoint = {
+            'stage': stage,
+            'fingerprint': fingerprint,
+            'saved_at': time.time(),
+            'result': result
+        }
+        path = self._path(stage)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+    def write_metadata(self, metadata: Dict[str, Any]):
+        with open(os.path.join(self.run_dir, 'run.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
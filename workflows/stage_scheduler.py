@@ -0,0 +1,118 @@
+import contextvars
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional
+from utils.tracing import span
+
+
+class Stage:
+    """A workflow step: `fn(results)` runs once every stage in `depends_on` has finished"""
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], depends_on: List[str] = None,
+                 resource: Optional[str] = None, label: str = ""):
+        self.name = name
+        self.fn = fn
+        self.depends_on = list(depends_on or [])
+        self.resource = resource
+        self.label = label
+
+
+class _ResourceGate:
+    """Counting gate whose capacity is re-evaluated on every acquire"""
+
+    def __init__(self, limit_fn: Callable[[], int]):
+        self.limit_fn = limit_fn
+        self.active = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            if self.active >= max(1, self.limit_fn()):
+                with span("resource_gate_wait", "wait", active=self.active):
+                    while self.active >= max(1, self.limit_fn()):
+                        self._condition.wait(timeout=1.0)
+            self.active += 1
+
+    def __exit__(self, *exc):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+
+class StageScheduler:
+    """
+    Runs a dependency graph of stages, starting each one as soon as its inputs exist.
+
+    Stages that name a `resource` share a gate whose capacity comes from
+    `resource_limits[resource]()`, so the rate limiter can serialize LLM-bound
+    stages while a model is throttled.
+    """
+
+    def __init__(self, max_workers: int = 4, resource_limits: Dict[str, Callable[[], int]] = None):
+        self.max_workers = max_workers
+        self.resource_limits = resource_limits or {}
+        self._gates: Dict[str, _ResourceGate] = {}
+
+    def _validate(self, stages: List[Stage]):
+        names = {stage.name for stage in stages}
+        if len(names) != len(stages):
+            raise ValueError("Duplicate stage names in workflow graph")
+        for stage in stages:
+            unknown = set(stage.depends_on) - names
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+
+        # Kahn's algorithm to reject cycles up front
+        remaining = {stage.name: set(stage.depends_on) for stage in stages}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle detected between stages: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _run_stage(self, stage: Stage, results: Dict[str, Any]) -> Any:
+        inputs = {name: results[name] for name in stage.depends_on}
+        gate = self._gates[stage.resource] if stage.resource else nullcontext()
+        with gate:
+            if stage.label:
+                print(f"\n{stage.label}")
+            with span(f"stage:{stage.name}", "stage"):
+                return stage.fn(inputs)
+
+    def run(self, stages: List[Stage]) -> Dict[str, Any]:
+        """Execute all stages and return their results keyed by stage name"""
+        self._validate(stages)
+        for stage in stages:
+            if stage.resource and stage.resource not in self._gates:
+                limit_fn = self.resource_limits.get(stage.resource, lambda: self.max_workers)
+                self._gates[stage.resource] = _ResourceGate(limit_fn)
+
+        pending = {stage.name: stage for stage in stages}
+        results: Dict[str, Any] = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.depends_on):
+                        # Run in a copy of this context so stage spans nest under the caller's span
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, self._run_stage, stage, dict(results))] = name
+                        del pending[name]
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        # Let in-flight stages finish, but start nothing new
+                        pending.clear()
+                        wait(list(running))
+                        raise error
+                    results[name] = future.result()
+
+        return results